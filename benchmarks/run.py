@@ -0,0 +1,197 @@
+"""
+Benchmarks for settings resolution.
+
+Run from the project root:
+
+    python -m benchmarks.run [--output results.json] [--compare baseline.json]
+
+Each benchmark reports the best time per operation over several repeats.
+Save results from one commit with ``--output``, and pass them to ``--compare``
+on another to see the relative change.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import timeit
+import tracemalloc
+
+from cbs import BaseSettings, cast, env
+
+BENCHMARKS = {}
+
+# Benchmarks reporting something other than seconds.
+UNITS = {}
+
+
+def benchmark(name, unit=None):
+    def decorator(func):
+        BENCHMARKS[name] = func
+        if unit:
+            UNITS[name] = unit
+        return func
+
+    return decorator
+
+
+def measure(stmt, setup=None, repeat=5):
+    """Returns the best time, in seconds, of one call to ``stmt``."""
+    timer = timeit.Timer(stmt, setup or "pass")
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+SETTINGS_MODULE = "benchmarks.settings_module"
+
+
+def import_settings():
+    sys.modules.pop(SETTINGS_MODULE, None)
+    return importlib.import_module(SETTINGS_MODULE)
+
+
+@benchmark("import_settings_module")
+def bench_import():
+    return measure(import_settings)
+
+
+@benchmark("cold_start_import")
+def bench_cold_start():
+    """Fresh interpreter importing the settings module, less a bare interpreter."""
+
+    def run(code):
+        subprocess.run([sys.executable, "-c", code], check=True)  # noqa: S603
+
+    bare = measure(lambda: run("pass"), repeat=3)
+    full = measure(lambda: run(f"import {SETTINGS_MODULE}"), repeat=3)
+    return full - bare
+
+
+@benchmark("use")
+def bench_use():
+    return measure(lambda: BaseSettings.use(env="BENCH_MODE"))
+
+
+@benchmark("dir")
+def bench_dir():
+    module = import_settings()
+    return measure(lambda: dir(module))
+
+
+def access_benchmarks():
+    module = import_settings()
+    settings = module.Settings()
+    cached = module.Settings(cache=True)
+
+    for label, name in [
+        ("plain", "LANGUAGE_CODE"),
+        ("env_str", "SECRET_KEY"),
+        ("env_bool", "DEBUG"),
+        ("env_list", "ALLOWED_HOSTS"),
+        ("callable", "INSTALLED_APPS"),
+        ("env_dburl", "DEFAULT_DATABASE"),
+        ("nested_dburl", "DATABASES"),
+    ]:
+        BENCHMARKS[f"access_{label}"] = lambda name=name: measure(lambda: getattr(settings, name))
+        BENCHMARKS[f"access_{label}_cached"] = lambda name=name: measure(lambda: getattr(cached, name))
+
+    BENCHMARKS["access_module_getattr"] = lambda: measure(lambda: module.DEBUG)
+    BENCHMARKS["access_module_global"] = lambda: measure(lambda: module.TIME_ZONE)
+
+
+access_benchmarks()
+
+
+@benchmark("env_instance_memory", unit="B")
+def bench_env_memory(count=10_000):
+    """Bytes allocated per ``env`` instance, with its env_name resolved."""
+    keys = [f"SETTING_{n}" for n in range(count)]
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        instances = [env("value", key=key) for key in keys]
+        for instance in instances:
+            instance.env_name
+        return (tracemalloc.get_traced_memory()[0] - before) / count
+    finally:
+        tracemalloc.stop()
+
+
+@benchmark("cast_json_repeat")
+def bench_cast_json():
+    """Casting the same large JSON value again, as each uncached access does."""
+    value = json.dumps({f"flag_{n}": {"enabled": n % 2 == 0, "groups": ["a", "b"]} for n in range(1000)})
+    return measure(lambda: cast.as_json(value))
+
+
+def deep_hierarchy(depth=20):
+    class Level0(BaseSettings):
+        BASE = env("base")
+
+        def METHOD(self):
+            return self.BASE
+
+    cls = Level0
+    for level in range(1, depth):
+        cls = type(f"Level{level}", (cls,), {f"SETTING_{level}": level})
+    return cls
+
+
+@benchmark("deep_hierarchy_define")
+def bench_deep_define():
+    return measure(deep_hierarchy)
+
+
+@benchmark("deep_hierarchy_access")
+def bench_deep_access():
+    settings = deep_hierarchy()()
+    return measure(lambda: settings.METHOD)
+
+
+@benchmark("deep_hierarchy_dir")
+def bench_deep_dir():
+    settings = deep_hierarchy()()
+    return measure(settings.dir_factory())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    parser.add_argument("--compare", help="Compare against results in this JSON file.")
+    parser.add_argument("names", nargs="*", help="Only run benchmarks containing these names.")
+    args = parser.parse_args(argv)
+
+    os.environ.pop("BENCH_MODE", None)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as fin:
+            baseline = json.load(fin)["results"]
+
+    results = {}
+    for name, func in BENCHMARKS.items():
+        if args.names and not any(part in name for part in args.names):
+            continue
+        results[name] = func()
+        if name in UNITS:
+            line = f"{name:32} {results[name]:14.1f} {UNITS[name]}"
+        else:
+            line = f"{name:32} {results[name] * 1e9:14.1f} ns"
+        if name in baseline:
+            line += f"  {results[name] / baseline[name]:6.2f}x"
+        print(line)
+
+    if args.output:
+        with open(args.output, "w") as fout:
+            json.dump(
+                {"python": platform.python_version(), "results": results},
+                fout,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Command line tools for ``cbs``.
+
+    python -m cbs compile myproject.settings --mode prod --output myproject/compiled_settings.py
+"""
+
+import argparse
+import os
+import sys
+
+from . import export
+
+
+def compile_settings(args):
+    if args.keep_env and args.format == "json":
+        raise SystemExit("--keep-env can't be used with --format json")
+
+    if args.mode is not None:
+        os.environ[args.env] = args.mode
+
+    sys.path.insert(0, os.getcwd())
+
+    if args.format == "json":
+        output = export.as_json(args.module)
+    else:
+        output = export.as_python(args.module, keep_env=args.keep_env)
+
+    if args.output:
+        with open(args.output, "w") as fout:
+            fout.write(output)
+    else:
+        sys.stdout.write(output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m cbs", description="Tools for django-classy-settings.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compile_parser = commands.add_parser(
+        "compile",
+        help="Write a settings module's resolved values as a plain Python module.",
+        description="Import a settings module, resolve every setting, and write out their values.",
+    )
+    compile_parser.add_argument("module", help="Dotted name of the settings module, e.g. myproject.settings")
+    compile_parser.add_argument("--mode", help="Settings mode to use, instead of the current value of --env.")
+    compile_parser.add_argument("--env", default="DJANGO_MODE", help="Env var the module reads its mode from.")
+    compile_parser.add_argument("--format", choices=["python", "json"], default="python")
+    compile_parser.add_argument(
+        "--keep-env",
+        action="store_true",
+        help="Leave env-based settings as os.environ lookups, rather than their current value.",
+    )
+    compile_parser.add_argument("--output", "-o", help="File to write to. Defaults to stdout.")
+    compile_parser.set_defaults(func=compile_settings)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,31 @@
 """Type-casting helper functions."""
 
+import json
+import math
+import operator
+import re
+from datetime import timedelta
+from functools import lru_cache
+from types import MappingProxyType
+
+TRUE_VALUES = frozenset(("y", "yes", "on", "t", "true", "1"))
+FALSE_VALUES = frozenset(("n", "no", "off", "f", "false", "0"))
+
+# Number of distinct values remembered by the parsing casts below.
+CACHE_SIZE = 128
+
+DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h|d|w)")
+
+BYTESIZE_UNITS = {
+    "": 1,
+    "b": 1,
+    **{f"{prefix}b": 1000**n for n, prefix in enumerate("kmgt", 1)},
+    **{f"{prefix}ib": 1024**n for n, prefix in enumerate("kmgt", 1)},
+    **{prefix: 1024**n for n, prefix in enumerate("kmgt", 1)},
+}
+BYTESIZE = re.compile(r"(\d+(?:\.\d+)?)\s*([a-z]*)")
+
 
 def as_bool(value: str) -> bool:
     """Smart cast value to bool
@@ -13,9 +39,9 @@ def as_bool(value: str) -> bool:
     if isinstance(value, bool):
         return value
     value = value.strip().lower()
-    if value in ("y", "yes", "on", "t", "true", "1"):
+    if value in TRUE_VALUES:
         return True
-    if value in ("n", "no", "off", "f", "false", "0"):
+    if value in FALSE_VALUES:
         return False
     raise ValueError(f"Unrecognised value for bool: {value !r}")
 
@@ -26,7 +52,7 @@ def as_list(value: str) -> list:
     """
     if isinstance(value, list):
         return value
-    return [x.strip() for x in value.split(",") if x.strip()]
+    return list(filter(None, map(str.strip, value.split(","))))
 
 
 def as_tuple(value: str) -> tuple:
@@ -35,4 +61,212 @@ def as_tuple(value: str) -> tuple:
     """
     if isinstance(value, tuple):
         return value
-    return tuple(as_list(value))
+    return tuple(filter(None, map(str.strip, value.split(","))))
+
+
+@lru_cache(maxsize=None)
+def list_of(item=str, sep=","):
+    """Returns a function to cast a value to a list of ``item``.
+
+    The input is split on ``sep``, and each non-empty element is stripped and
+    passed to ``item``. The same function is returned for the same arguments.
+
+    :param func item: Function to cast each element.
+    :param str sep: Separator to split on.
+    """
+    if item is str:
+
+        def as_list_of(value: str) -> list:
+            if isinstance(value, list):
+                return value
+            return list(filter(None, map(str.strip, value.split(sep))))
+
+    else:
+
+        def as_list_of(value: str) -> list:
+            if isinstance(value, list):
+                return value
+            return list(map(item, filter(None, map(str.strip, value.split(sep)))))
+
+    # So cbs.export can write out how to make this again.
+    as_list_of._factory = (list_of, (item, sep))
+    return as_list_of
+
+
+@lru_cache(maxsize=None)
+def tuple_of(item=str, sep=","):
+    """Returns a function to cast a value to a tuple of ``item``.
+
+    See :py:func:`list_of`.
+    """
+    to_list = list_of(item, sep)
+
+    def as_tuple_of(value: str) -> tuple:
+        if isinstance(value, tuple):
+            return value
+        return tuple(to_list(value))
+
+    as_tuple_of._factory = (tuple_of, (item, sep))
+    return as_tuple_of
+
+
+@lru_cache(maxsize=None)
+def set_of(item=str, sep=","):
+    """Returns a function to cast a value to a frozenset of ``item``.
+
+    See :py:func:`list_of`.
+    """
+    to_list = list_of(item, sep)
+
+    def as_set_of(value: str) -> frozenset:
+        if isinstance(value, frozenset):
+            return value
+        return frozenset(to_list(value))
+
+    as_set_of._factory = (set_of, (item, sep))
+    return as_set_of
+
+
+class frozendict(dict):  # noqa: N801
+    """A ``dict`` which can't be changed, and is hashable if its values are.
+
+    As it is still a ``dict``, it can be used anywhere one is expected, so
+    long as nothing tries to change it. ``copy()`` returns a plain ``dict``.
+    """
+
+    __slots__ = ()
+
+    def _immutable(self, *args, **kwargs):  # noqa: ARG002
+        raise TypeError(f"{type(self).__name__!r} object is immutable")
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __hash__(self):
+        return hash(frozenset(self.items()))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict.__repr__(self)})"
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+
+def freeze(value):
+    """Returns an immutable copy of ``value``, recursively.
+
+    ``dict`` becomes :py:class:`frozendict`, ``list`` becomes ``tuple``, and
+    ``set`` becomes ``frozenset``. A ``frozendict`` or ``frozenset`` is taken
+    to be frozen already, as is a ``tuple`` holding nothing to freeze, and
+    returned as is. Anything else is returned as is.
+    """
+    if isinstance(value, (dict, MappingProxyType)) and not isinstance(value, frozendict):
+        return frozendict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, tuple):
+        items = tuple(map(freeze, value))
+        if all(map(operator.is_, items, value)):
+            return value
+        return type(value)._make(items) if hasattr(value, "_fields") else items
+    if isinstance(value, (list, set)):
+        return (tuple if isinstance(value, list) else frozenset)(map(freeze, value))
+    return value
+
+
+# The casts below parse each distinct value only once. Their results are
+# shared between callers, so are immutable.
+
+
+def as_json(value: str):
+    """Cast value from JSON, made immutable with :py:func:`freeze`.
+
+    Objects become :py:class:`frozendict`, and arrays ``tuple``.
+    """
+    if not isinstance(value, str):
+        return value
+    return _parse_json(value)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_json(value):
+    return freeze(json.loads(value))
+
+
+def as_dict(value: str) -> frozendict:
+    """
+    Cast value to a :py:class:`frozendict` by splitting the input on ",", and
+    each part on "=", e.g. ``"a=1, b=2"``.
+    """
+    if not isinstance(value, str):
+        return value
+    return _parse_dict(value)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_dict(value):
+    result = {}
+    for part in filter(None, map(str.strip, value.split(","))):
+        key, sep, item = part.partition("=")
+        if not sep:
+            raise ValueError(f"Expected key=value, not {part!r}")
+        result[key.strip()] = item.strip()
+    return frozendict(result)
+
+
+def as_duration(value: str):
+    """Cast value to a number of seconds.
+
+    Accepts a number of seconds, or numbers with units, e.g. ``"30s"``,
+    ``"1h30m"`` or ``"500ms"``. Units are ``ms``, ``s``, ``m``, ``h``, ``d``
+    and ``w``.
+
+    Returns an ``int`` when the duration is a whole number of seconds.
+    """
+    if not isinstance(value, str):
+        return value
+    return _parse_duration(value)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_duration(value):
+    text = value.strip().lower().replace(" ", "")
+    try:
+        seconds = float(text)
+    except ValueError:
+        parts = DURATION_PART.findall(text)
+        if not parts or "".join(number + unit for number, unit in parts) != text:
+            raise ValueError(f"Unrecognised value for duration: {value!r}") from None
+        seconds = sum(float(number) * DURATION_UNITS[unit] for number, unit in parts)
+    if not math.isfinite(seconds):
+        raise ValueError(f"Unrecognised value for duration: {value!r}")
+    return int(seconds) if seconds.is_integer() else seconds
+
+
+def as_timedelta(value: str) -> timedelta:
+    """Cast value to a ``timedelta``.
+
+    See :py:func:`as_duration`.
+    """
+    if isinstance(value, timedelta):
+        return value
+    return timedelta(seconds=as_duration(value))
+
+
+def as_bytesize(value: str) -> int:
+    """Cast value to a number of bytes.
+
+    Accepts a number of bytes, or a number with units, e.g. ``"64MB"`` or
+    ``"1.5GiB"``. Units are not case sensitive. ``KB``, ``MB``, ``GB`` and
+    ``TB`` are powers of 1000; ``KiB``, ``MiB``, ``GiB`` and ``TiB``, and
+    ``K``, ``M``, ``G`` and ``T``, are powers of 1024.
+    """
+    if not isinstance(value, str):
+        return value
+    return _parse_bytesize(value)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_bytesize(value):
+    match = BYTESIZE.fullmatch(value.strip().lower())
+    if match is None or match[2] not in BYTESIZE_UNITS or not math.isfinite(float(match[1])):
+        raise ValueError(f"Unrecognised value for size: {value!r}")
+    return int(float(match[1]) * BYTESIZE_UNITS[match[2]])
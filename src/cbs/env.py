@@ -1,22 +1,162 @@
 import os
+from collections import namedtuple
+from collections.abc import Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
 from functools import partial
+from types import CoroutineType
 
-from django.utils.functional import cached_property
-
-from . import cast
-from .urls import parse_dburl
+from . import cast, tracking
+from .cast import freeze
+from .sources import Chain
+from .urls import parse_cacheurl, parse_dburl, parse_dburl_set
 
 __all__ = ["env"]
 
+# Where values are read from, if not os.environ.
+_source = None
+
+# Copy of the environment for the current resolution pass, if any.
+_snapshot = ContextVar("cbs_environ", default=None)
+
+
+def set_source(*sources):
+    """Set where ``env`` reads values from, instead of ``os.environ``.
+
+    When given several sources, they are consulted in order, e.g.:
+
+    .. code-block:: python
+
+        set_source(os.environ, SecretsDir("/run/secrets"), DotEnv(".env"))
+
+    Call with no arguments to revert to ``os.environ``.
+
+    :param Mapping sources: Sources to read from. See :py:mod:`cbs.sources`.
+    """
+    global _source  # noqa: PLW0603
+    if not sources:
+        _source = None
+    elif len(sources) == 1:
+        _source = sources[0]
+    else:
+        _source = Chain(*sources)
+
+
+def get_source():
+    """Returns the source set by ``set_source``, or ``os.environ``."""
+    return os.environ if _source is None else _source
+
+
+def get_environ():
+    """Returns the environment mapping to read values from.
+
+    This is the current ``snapshot``, if there is one, otherwise ``get_source()``.
+    """
+    environ = _snapshot.get()
+    if environ is None:
+        return get_source()
+    return environ
+
+
+class _Snapshot(Mapping):
+    """Copy of a source which reads each value only when first used, then keeps it.
+
+    So file based sources aren't read in full just to take a snapshot.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, source):
+        self.source = source
+        self.values = {}
+
+    def __getitem__(self, key):
+        try:
+            value = self.values[key]
+        except KeyError:
+            try:
+                value = self.source[key]
+            except KeyError:
+                value = self._MISSING
+            value = self.values.setdefault(key, value)
+        if value is self._MISSING:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self):
+        return iter(self.source)
+
+    def __len__(self):
+        return len(self.source)
+
+
+def _copy(environ):
+    """Returns a copy of ``environ`` for ``snapshot``."""
+    if environ is os.environ or isinstance(environ, dict):
+        return dict(environ)
+    if isinstance(environ, Chain):
+        environ = Chain(*(dict(source) if source is os.environ else source for source in environ.sources))
+    return _Snapshot(environ)
+
+
+@contextmanager
+def snapshot(environ=None):
+    """Context manager to resolve settings against one copy of the environment.
+
+    All ``env`` lookups within the block read from a single ``dict`` copy of
+    the source, which is cheaper than ``os.environ``, and unaffected by any
+    changes made to it meanwhile. Other sources, such as
+    :py:class:`~cbs.sources.SecretsDir`, are only read for the names looked up,
+    and the value first read is kept for the rest of the block.
+
+    Nested calls without ``environ`` re-use the outer snapshot.
+
+    :param Mapping environ: Mapping to use instead of ``get_source()``.
+    """
+    if environ is None:
+        if _snapshot.get() is not None:
+            yield
+            return
+        environ = get_source()
+    token = _snapshot.set(_copy(environ))
+    try:
+        yield
+    finally:
+        _snapshot.reset(token)
+
+
+class _AwaitCast:
+    """Awaitable to cast the result of an ``async`` getter, as ``env.__get__`` does for others."""
+
+    __slots__ = ("cast", "coro", "frozen")
+
+    def __init__(self, coro, cast, frozen=False):
+        self.coro = coro
+        self.cast = cast
+        self.frozen = frozen
+
+    def __await__(self):
+        value = yield from self.coro.__await__()
+        if self.cast and isinstance(value, str):
+            value = self.cast(value)
+        if self.frozen:
+            value = freeze(value)
+        return value
+
+    def close(self):
+        self.coro.close()
+
+
 # Target supported env types:
 # + str : noop
 # + int : int()
 # + bool: as_bool
 # + list<str>
-# - list<int>
+# + list<int>
 # + tuple<str>
+# + JSON, key=value maps, durations and sizes
 # + DB Config: db-url
-# - Cache Config: db-url
+# + Cache Config: cache-url
 
 
 class env:  # noqa: N801
@@ -34,6 +174,10 @@ class env:  # noqa: N801
 
     :param str prefix: Prefix to ``key`` when looking up ``os.environ``
     :param func cast: Function to cast ``str`` values.
+    :param bool frozen: Return values made immutable with
+        :py:func:`.cast.freeze`, so they can be shared, and hashed.
+
+        (Defaults to ``FROZEN``, which is ``False``)
 
     """
 
@@ -41,6 +185,9 @@ class env:  # noqa: N801
         pass
 
     PREFIX = ""
+    FROZEN = False
+
+    __slots__ = ("_key", "_prefix", "cast", "default", "env_name", "frozen", "getter")
 
     def __new__(cls, *args, **kwargs):
         """
@@ -55,11 +202,12 @@ class env:  # noqa: N801
 
     def __class_getitem__(cls, key):
         """Helper to allow creating env sub-classes with PREFIX pre-set."""
-        return type(f"{cls.__name__}__{key}", (cls,), {"PREFIX": key})
+        return type(f"{cls.__name__}__{key}", (cls,), {"PREFIX": key, "__slots__": ()})
 
-    def __init__(self, getter, key=None, cast=None, prefix=None):
+    def __init__(self, getter, key=None, cast=None, prefix=None, frozen=None):
         self.cast = cast
-        self.key = key
+        self.frozen = self.FROZEN if frozen is None else frozen
+        self._key = key
         self.prefix = prefix or self.PREFIX
 
         if getter is not self.Required and callable(getter):
@@ -68,36 +216,77 @@ class env:  # noqa: N801
             self.getter = None
             self.default = getter
 
-    @cached_property
-    def env_name(self):
-        return f"{self.prefix}{self.key}"
+    # env_name is only rebuilt when key or prefix change, not on every lookup.
+
+    @property
+    def key(self):
+        return self._key
+
+    @key.setter
+    def key(self, value):
+        self._key = value
+        self.env_name = f"{self._prefix}{value}"
+
+    @property
+    def prefix(self):
+        return self._prefix
+
+    @prefix.setter
+    def prefix(self, value):
+        self._prefix = value
+        self.env_name = f"{value}{self._key}"
+
+    @property
+    def required(self):
+        """``True`` if this can only be satisfied by the environment."""
+        return self.getter is None and self.default is self.Required
 
     def __set_name__(self, owner, name):
-        if self.key is None:
+        if self._key is None:
             self.key = name
 
+    def _read(self, environ):
+        """Returns the raw value from ``environ``, or raises ``KeyError``."""
+        return environ[self.env_name]
+
     def __get__(self, obj, cls=None):
         if obj is None:
             return self
 
+        environ = _snapshot.get()
+        if environ is None:
+            environ = os.environ if _source is None else _source
+
         try:
-            value = os.environ[self.env_name]
+            value = self._read(environ)
         except KeyError:
-            if self.getter is None:
-                if self.default is self.Required:
-                    raise ValueError(f"Environment variable {self.env_name} is required but not set.")
-                value = self.default
-            else:
-                try:
-                    value = self.getter(obj)
-                except Exception as e:
-                    raise e from None
+            value, source = self._fallback(obj)
+        else:
+            source = "environ"
+        tracking.note_env(self.env_name, source)
 
-        if self.cast and isinstance(value, str):
-            value = self.cast(value)
+        if self.cast:
+            if isinstance(value, str):
+                value = self.cast(value)
+            elif isinstance(value, CoroutineType):
+                return _AwaitCast(value, self.cast, self.frozen)
+
+        if self.frozen:
+            value = _AwaitCast(value, None, True) if isinstance(value, CoroutineType) else freeze(value)
 
         return value
 
+    def _fallback(self, obj):
+        """Returns the value to use when the env var is not set, and its source."""
+        if self.getter is None:
+            if self.default is self.Required:
+                raise ValueError(f"Environment variable {self.env_name} is required but not set.")
+            return self.default, "default"
+        try:
+            return self.getter(obj), "getter"
+        except Exception as e:
+            raise e from None
+
     def __call__(self):
         return self.__get__(self)
 
@@ -117,26 +306,213 @@ class env:  # noqa: N801
         """
         return cls(cast=int, *args, **kwargs)
 
+    @classmethod
+    def _frozen(cls, kwargs):
+        """Returns whether a helper is to make frozen values."""
+        frozen = kwargs.get("frozen")
+        return cls.FROZEN if frozen is None else frozen
+
     @classmethod
     def dburl(cls, *args, **kwargs):
         """Helper for DB-Url cast settings.
 
-        Uses :py:func:`.urls.parse_dburl`
+        Uses :py:func:`.urls.parse_dburl`, or its ``frozen`` variant when frozen.
+        """
+        parse = parse_dburl.frozen if cls._frozen(kwargs) else parse_dburl
+        return cls(cast=parse, *args, **kwargs)
+
+    @classmethod
+    def dburls(cls, *args, defaults=None, **kwargs):
+        """Helper for multiple DB-Url cast settings, yielding a whole ``DATABASES``.
+
+        The value may be a whitespace separated list of URLs. If the env var is
+        not set, numbered env vars are used instead, e.g. ``DATABASE_URL_0``,
+        ``DATABASE_URL_1``, etc.
+
+        Uses :py:func:`.urls.parse_dburl_set`
+
+        :param dict defaults: Values to apply to each entry that its URL
+            doesn't set.
+        """
+        kwargs.setdefault("prefix", cls.PREFIX)
+        kwargs["frozen"] = cls._frozen(kwargs)
+        return _dburls(cast=partial(parse_dburl_set, defaults=defaults, frozen=kwargs["frozen"]), *args, **kwargs)
+
+    @classmethod
+    def cacheurl(cls, *args, **kwargs):
+        """Helper for Cache-Url cast settings.
+
+        Uses :py:func:`.urls.parse_cacheurl`, or its ``frozen`` variant when frozen.
         """
-        return cls(cast=parse_dburl, *args, **kwargs)
+        parse = parse_cacheurl.frozen if cls._frozen(kwargs) else parse_cacheurl
+        return cls(cast=parse, *args, **kwargs)
 
     @classmethod
-    def list(cls, *args, **kwargs):
+    def list(cls, *args, item=str, sep=",", **kwargs):
         """Helper for list-cast settings.
 
-        Uses :py:func:`.cast.as_list`
+        Uses :py:func:`.cast.list_of`, or :py:func:`.cast.tuple_of` when frozen.
+
+        :param func item: Function to cast each element.
+        :param str sep: Separator to split on.
         """
-        return cls(cast=cast.as_list, *args, **kwargs)
+        factory = cast.tuple_of if cls._frozen(kwargs) else cast.list_of
+        return cls(cast=factory(item, sep), *args, **kwargs)
 
     @classmethod
-    def tuple(cls, *args, **kwargs):
+    def tuple(cls, *args, item=str, sep=",", **kwargs):
         """Helper for tuple-cast settings.
 
-        Uses :py:func:`.cast.as_tuple`
+        Uses :py:func:`.cast.tuple_of`
+
+        :param func item: Function to cast each element.
+        :param str sep: Separator to split on.
         """
-        return cls(cast=cast.as_tuple, *args, **kwargs)
+        return cls(cast=cast.tuple_of(item, sep), *args, **kwargs)
+
+    @classmethod
+    def frozenset(cls, *args, item=str, sep=",", **kwargs):
+        """Helper for frozenset-cast settings.
+
+        Uses :py:func:`.cast.set_of`
+
+        :param func item: Function to cast each element.
+        :param str sep: Separator to split on.
+        """
+        return cls(cast=cast.set_of(item, sep), *args, **kwargs)
+
+    @classmethod
+    def json(cls, *args, **kwargs):
+        """Helper for JSON settings.
+
+        Uses :py:func:`.cast.as_json`
+        """
+        return cls(cast=cast.as_json, *args, **kwargs)
+
+    @classmethod
+    def dict(cls, *args, **kwargs):
+        """Helper for ``key=value,key2=value2`` settings.
+
+        Uses :py:func:`.cast.as_dict`
+        """
+        return cls(cast=cast.as_dict, *args, **kwargs)
+
+    @classmethod
+    def duration(cls, *args, timedelta=False, **kwargs):
+        """Helper for duration settings, e.g. ``"30s"``, yielding seconds.
+
+        Uses :py:func:`.cast.as_duration`
+
+        :param bool timedelta: Yield a ``timedelta`` instead, using
+            :py:func:`.cast.as_timedelta`.
+        """
+        return cls(cast=cast.as_timedelta if timedelta else cast.as_duration, *args, **kwargs)
+
+    @classmethod
+    def bytesize(cls, *args, **kwargs):
+        """Helper for size settings, e.g. ``"64MB"``, yielding bytes.
+
+        Uses :py:func:`.cast.as_bytesize`
+        """
+        return cls(cast=cast.as_bytesize, *args, **kwargs)
+
+    @classmethod
+    def group(cls, key=None, *, as_dict=False, prefix=None, frozen=None, **members):
+        """Helper for a group of settings sharing a prefix, yielding them all at once.
+
+        Each member is an ``env``, or a default value, and reads the env var
+        named by the group's prefix and its own name. The value is a
+        ``namedtuple`` of the members, e.g.:
+
+        .. code-block:: python
+
+            REDIS = env.group(HOST="localhost", PORT=env.int(6379))  # REDIS_HOST, REDIS_PORT
+
+        Every member is checked, and any errors raised together.
+
+        :param str key: Prefix of the members' env vars.
+            (Defaults to the class attribute name and ``_``)
+        :param bool as_dict: Yield a ``dict`` instead of a ``namedtuple``.
+        """
+        members = {name: value if isinstance(value, env) else cls(value) for name, value in members.items()}
+        frozen = cls._frozen({"frozen": frozen})
+        return _group(members, key=key, as_dict=as_dict, prefix=prefix or cls.PREFIX, frozen=frozen)
+
+
+class _dburls(env):  # noqa: N801
+    """``env`` which also reads numbered env vars, for ``env.dburls``."""
+
+    __slots__ = ()
+
+    def _read(self, environ):
+        try:
+            return environ[self.env_name]
+        except KeyError:
+            pass
+        prefix = f"{self.env_name}_"
+        indexed = sorted(
+            (int(key[len(prefix) :]), key, value)
+            for key, value in environ.items()
+            if key.startswith(prefix) and key[len(prefix) :].isdigit()
+        )
+        if not indexed:
+            raise KeyError(self.env_name)
+        for _, key, _ in indexed:
+            tracking.note_env(key, "environ")
+        return " ".join(value for _, _, value in indexed)
+
+
+class _group(env):  # noqa: N801
+    """``env`` yielding the values of several others, for ``env.group``."""
+
+    __slots__ = ("as_dict", "members", "namespace")
+
+    def __init__(self, members, key=None, as_dict=False, prefix=None, frozen=None):
+        self.members = members
+        self.as_dict = as_dict
+        self.namespace = namedtuple("Group", members)
+        super().__init__(None, key=key, prefix=prefix, frozen=frozen)
+        self._bind()
+
+    def _bind(self):
+        for name, member in self.members.items():
+            if member.key is None:
+                member.key = name
+            member.prefix = self.env_name
+
+    @property
+    def required(self):
+        return any(member.required for member in self.members.values())
+
+    def __set_name__(self, owner, name):
+        if self._key is None:
+            self.key = f"{name}_"
+            self._bind()
+        namespace = namedtuple(name, self.members, module=owner.__module__)
+        namespace.__qualname__ = f"{owner.__qualname__}.{name}"
+        # The type can't be found by its name, so pickle by where it's made.
+        namespace.__reduce__ = lambda value: (_group_value, (owner, name, tuple(value)))
+        self.namespace = namespace
+
+    def __get__(self, obj, cls=None):
+        if obj is None:
+            return self
+
+        values, errors = {}, []
+        for name, member in self.members.items():
+            try:
+                values[name] = member.__get__(obj)
+            except ValueError as e:  # noqa: PERF203
+                errors.append(str(e) if member.env_name in str(e) else f"{member.env_name}: {e}")
+        if errors:
+            raise ValueError(f"Invalid settings in group {self.env_name}: {'; '.join(errors)}")
+
+        value = values if self.as_dict else self.namespace(**values)
+        if self.frozen:
+            value = freeze(value)
+        return value
+
+
+def _group_value(owner, name, values):
+    """Rebuilds an ``env.group`` value, when unpickling."""
+    return vars(owner)[name].namespace._make(values)
@@ -0,0 +1,271 @@
+"""
+Write out the resolved values of a settings module, so they can be loaded
+without ``cbs``.
+
+See ``python -m cbs compile --help``.
+"""
+
+import json
+from collections.abc import Mapping
+from datetime import timedelta
+from functools import partial
+from importlib import import_module
+from pathlib import Path, PurePath
+
+from .cast import frozendict
+from .env import env as env_property
+from .env import get_source, snapshot
+
+__all__ = ["as_json", "as_python", "collect"]
+
+HEADER = '''"""
+Settings compiled from {module} by ``python -m cbs compile``.
+
+Do not edit; compile again instead.
+"""
+'''
+
+ENV_HELPER = """
+_REQUIRED = object()
+
+
+def _env(name, default=_REQUIRED, cast=None):
+    try:
+        value = os.environ[name]
+    except KeyError:
+        if default is _REQUIRED:
+            raise ValueError(f"Environment variable {name} is required but not set.") from None
+        return default
+    return value if cast is None else cast(value)
+
+"""
+
+# Containers whose literal is longer than this are split over several lines.
+WIDTH = 80
+
+
+def collect(module, keep_env=False):
+    """Resolve all the settings in a module.
+
+    :param module: A settings module, which has called ``BaseSettings.use``.
+    :param bool keep_env: Return the ``env`` properties of settings read from
+        the environment, instead of resolving them.
+    :return: dict of name to value, and dict of name to ``env`` for those kept.
+    """
+    names = [name for name in dir(module) if name.isupper()]
+
+    kept = {}
+    settings = getattr(getattr(module, "__getattr__", None), "settings", None)
+    if keep_env and settings is not None:
+        module_vars = vars(module)
+        for name in names:
+            if name in module_vars:
+                continue
+            prop = getattr(type(settings), name, None)
+            # Only plain lookups; e.g. env.dburls also reads numbered vars.
+            if (
+                isinstance(prop, env_property)
+                and type(prop)._read is env_property._read
+                and type(prop).__get__ is env_property.__get__
+            ):
+                kept[name] = prop
+
+    with snapshot():
+        values = {name: getattr(module, name) for name in names if name not in kept}
+
+    return values, kept
+
+
+def _default(settings, prop):
+    """Resolve a setting as if its env var were not set."""
+    environ = dict(get_source())
+    environ.pop(prop.env_name, None)
+    with snapshot(environ):
+        # Not getattr, which would return any cached value, read from the env var.
+        return prop.__get__(settings)
+
+
+def _reference(func, imports):
+    """Returns an expression naming ``func``, or ``None`` if it can't be imported."""
+    if isinstance(func, partial):
+        return _partial_reference(func, imports)
+    if hasattr(func, "_factory"):
+        return _factory_reference(func, imports)
+
+    module, qualname = getattr(func, "__module__", None), getattr(func, "__qualname__", "")
+    if not module or "<" in qualname:
+        return None
+    if module == "builtins":
+        return qualname
+
+    target = import_module(module)
+    for part in qualname.split("."):
+        target = getattr(target, part, None)
+    if target is not func:
+        return None
+    imports.add(module)
+    return f"{module}.{qualname}"
+
+
+def _partial_reference(func, imports):
+    """As ``_reference``, for a ``partial``."""
+    ref = _reference(func.func, imports)
+    if ref is None:
+        return None
+    try:
+        args = [_literal(arg, imports) for arg in func.args]
+        args.extend(f"{key}={_literal(value, imports)}" for key, value in func.keywords.items())
+    except TypeError:
+        return None
+    imports.add("functools")
+    return f"functools.partial({', '.join([ref, *args])})"
+
+
+def _factory_reference(func, imports):
+    """As ``_reference``, for functions made by e.g. ``list_of(int)``."""
+    make, args = func._factory
+    refs = [_reference(make, imports), *(_reference(arg, imports) if callable(arg) else repr(arg) for arg in args)]
+    if None in refs:
+        return None
+    return f"{refs[0]}({', '.join(refs[1:])})"
+
+
+def _scalar(value, imports):
+    """Returns Python source for ``value``, or ``None`` if it's a container."""
+    if value is None or type(value) in (bool, int, float, str, bytes):
+        return repr(value)
+
+    if isinstance(value, PurePath):
+        imports.add("pathlib")
+        kind = "Path" if isinstance(value, Path) else "PurePath"
+        return f"pathlib.{kind}({str(value)!r})"
+
+    if isinstance(value, timedelta):
+        imports.add("datetime")
+        return f"datetime.timedelta(seconds={value.total_seconds()!r})"
+
+    return None
+
+
+def _literal(value, imports, indent=""):
+    """Returns Python source for ``value``."""
+    scalar = _scalar(value, imports)
+    if scalar is not None:
+        return scalar
+
+    if isinstance(value, Mapping):
+        items = [
+            f"{_literal(key, imports)}: {_literal(item, imports, indent + '    ')}" for key, item in value.items()
+        ]
+        start, end = "{", "}"
+        if isinstance(value, frozendict):
+            imports.add("cbs.cast")
+            start, end = "cbs.cast.frozendict({", "})"
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        if hasattr(value, "_fields"):
+            # e.g. from env.group; rebuilt as a namedtuple of the same name.
+            imports.add("collections")
+            start, end = f"collections.namedtuple({type(value).__name__!r}, {list(value._fields)!r})(", ")"
+        elif isinstance(value, (set, frozenset)):
+            if not value:
+                return f"{type(value).__name__}()"
+            start, end = ("{", "}") if isinstance(value, set) else ("frozenset({", "})")
+            value = sorted(value, key=repr)
+        else:
+            start, end = ("[", "]") if isinstance(value, list) else ("(", ")")
+        items = [_literal(item, imports, indent + "    ") for item in value]
+        if start == "(" and len(items) == 1:
+            items[0] += ","
+    else:
+        raise TypeError(f"Can't write {type(value).__name__} value {value!r} as a literal")
+
+    inline = f"{start}{', '.join(items)}{end}"
+    if len(indent) + len(inline) <= WIDTH or not items:
+        return inline
+    inner = indent + "    "
+    lines = "".join(f"{inner}{item},\n" for item in items)
+    return f"{start}\n{lines}{indent}{end}"
+
+
+def as_python(module, keep_env=False):
+    """Returns the source of a Python module with all of ``module``'s settings.
+
+    :param module: A settings module, or its dotted name.
+    :param bool keep_env: Leave settings read from the environment as
+        ``os.environ`` lookups, with their resolved default, rather than
+        fixing their current value. Their cast must be importable, e.g.
+        ``int`` or ``cbs.cast.as_bool``, or the value is fixed anyway.
+    """
+    if isinstance(module, str):
+        module = import_module(module)
+
+    values, kept = collect(module, keep_env=keep_env)
+    settings = module.__getattr__.settings if kept else None
+
+    imports = set()
+    lines = []
+    for name in sorted({**values, **kept}):
+        if name in values:
+            lines.append(f"{name} = {_literal(values[name], imports)}")
+            continue
+        prop = kept[name]
+        cast = None if prop.cast is None else _reference(prop.cast, imports)
+        if prop.cast is not None and cast is None:
+            lines.append(f"# Value fixed, as its cast can't be imported: {prop.cast!r}")
+            lines.append(f"{name} = {_literal(getattr(settings, name), imports)}")
+            continue
+        args = [repr(prop.env_name)]
+        if not prop.required:
+            args.append(_literal(_default(settings, prop), imports))
+        if cast is not None:
+            args.append(f"cast={cast}")
+        lines.append(f"{name} = _env({', '.join(args)})")
+
+    parts = [HEADER.format(module=module.__name__)]
+    if kept:
+        imports.add("os")
+    if imports:
+        parts.append("".join(f"import {name}\n" for name in sorted(imports)))
+    if kept:
+        parts.append(ENV_HELPER)
+    parts.append("\n".join(lines) + "\n")
+    return "\n".join(parts)
+
+
+def _json_value(value):
+    """Returns ``value`` with any namedtuples, e.g. from ``env.group``, as dicts."""
+    if hasattr(value, "_fields"):
+        return {key: _json_value(item) for key, item in zip(value._fields, value)}
+    if isinstance(value, Mapping):
+        return {key: _json_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_value(item) for item in value]
+    return value
+
+
+def _json_default(value):
+    if isinstance(value, PurePath):
+        return str(value)
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Can't write {type(value).__name__} value {value!r} as JSON")
+
+
+def as_json(module):
+    """Returns a JSON object of all of ``module``'s settings.
+
+    Tuples and sets are written as lists, namedtuples as objects, paths as
+    strings, and timedeltas as seconds.
+
+    :param module: A settings module, or its dotted name.
+    """
+    if isinstance(module, str):
+        module = import_module(module)
+
+    values, _ = collect(module)
+    values = {name: _json_value(value) for name, value in values.items()}
+    return json.dumps(values, indent=2, sort_keys=True, default=_json_default) + "\n"
@@ -0,0 +1,206 @@
+"""
+Reload settings when the files they are read from change, without restarting.
+
+Only settings in a cached instance are reloaded, and only those which read an
+env var that changed, along with any settings which use them.
+"""
+
+import logging
+import os
+import select
+import sys
+from copy import copy
+from threading import Event, Thread
+
+from .env import get_source, snapshot
+from .settings import _dependents, _reading
+from .sources import Chain, DotEnv, SecretsDir
+
+__all__ = ["Reloader", "apply_environ"]
+
+log = logging.getLogger(__name__)
+
+# From <sys/inotify.h>
+IN_MODIFY = 0x2
+IN_ATTRIB = 0x4
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+
+def apply_environ(settings, keys, environ=None):
+    """Re-resolve the cached settings which read any of the env vars ``keys``.
+
+    Settings using those are re-resolved too. They are resolved on a copy of
+    the instance, and its cache then swapped in, so other threads see either
+    all the old values or all the new ones.
+
+    :param BaseSettings settings: Instance created with ``cache=True``.
+    :param keys: Names of the env vars which changed.
+    :param Mapping environ: Environment to resolve against. Defaults to
+        ``get_source()``.
+    :return: dict of setting name to new value, for those whose value changed.
+    """
+    cache = settings._cache
+    if cache is None:
+        raise ValueError("Reloading needs a settings instance created with cache=True.")
+
+    graph = settings._graph.copy()
+    affected = _dependents(graph, _reading(graph, keys))
+    if not affected:
+        return {}
+
+    staging = copy(settings)
+    staging._cache = {name: value for name, value in cache.copy().items() if name not in affected}
+    staging._graph = {name: resolution for name, resolution in graph.items() if name not in affected}
+    staging._locks = {}
+
+    with snapshot(environ):
+        values = {name: getattr(staging, name) for name in affected}
+
+    settings._graph = staging._graph
+    settings._cache = staging._cache
+
+    return {name: value for name, value in values.items() if name not in cache or cache[name] != value}
+
+
+def _notify(sender, changed):
+    """Update Django's settings, and send ``setting_changed``, if Django is in use."""
+    if not changed or "django.core.signals" not in sys.modules:
+        return
+
+    from django.conf import settings as django_settings
+    from django.core.signals import setting_changed
+
+    for name, value in changed.items():
+        if django_settings.configured:
+            setattr(django_settings, name, value)
+        setting_changed.send(sender=sender, setting=name, value=value, enter=True)
+
+
+def _source_paths():
+    """Returns the paths of the file based sources in ``get_source()``."""
+    source = get_source()
+    sources = source.sources if isinstance(source, Chain) else (source,)
+    return [source.path for source in sources if isinstance(source, (DotEnv, SecretsDir))]
+
+
+def _inotify(paths):
+    """Returns an inotify fd watching ``paths``, or ``None`` if unavailable."""
+    if not sys.platform.startswith("linux"):
+        return None
+
+    import ctypes
+
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+    except (AttributeError, OSError):
+        return None
+    if fd < 0:
+        return None
+
+    for path in paths:
+        # Watch the directory, as files are often replaced rather than written.
+        target = path if os.path.isdir(path) else os.path.dirname(os.path.abspath(path))
+        if libc.inotify_add_watch(fd, os.fsencode(target), WATCH_MASK) < 0:
+            os.close(fd)
+            return None
+    return fd
+
+
+class Reloader:
+    """Watches the files settings are read from, and reloads settings when they change.
+
+    Uses inotify where available, else checks every ``interval`` seconds.
+
+    When any setting changes, and Django is in use, ``django.conf.settings`` is
+    updated, and Django's ``setting_changed`` signal is sent for it, with
+    ``enter=True``.
+
+    :param BaseSettings settings: Instance created with ``cache=True``.
+    :param list paths: Files or directories to watch. Defaults to those of
+        any ``DotEnv`` or ``SecretsDir`` passed to ``set_source``.
+    :param float interval: Seconds between checks, when polling.
+    :param bool inotify: Set to ``False`` to always poll.
+    """
+
+    def __init__(self, settings, paths=None, interval=1.0, inotify=True):
+        if settings._cache is None:
+            raise ValueError("Reloading needs a settings instance created with cache=True.")
+        if paths is None:
+            paths = _source_paths()
+        if not paths:
+            raise ValueError("Nothing to watch: pass paths, or use set_source() with DotEnv or SecretsDir.")
+
+        self.settings = settings
+        self.paths = [os.fspath(path) for path in paths]
+        self.interval = interval
+        self.inotify = inotify
+        self.environ = dict(get_source())
+
+        self._stop = Event()
+        self._thread = None
+
+    def check(self):
+        """Reload settings using any env vars changed since the last check.
+
+        :return: dict of setting name to new value, for those whose value changed.
+        """
+        environ = dict(get_source())
+        previous = self.environ
+        keys = {key for key in previous.keys() | environ.keys() if previous.get(key) != environ.get(key)}
+        if not keys:
+            return {}
+
+        changed = apply_environ(self.settings, keys, environ)
+        self.environ = environ
+        _notify(type(self.settings), changed)
+        return changed
+
+    def start(self):
+        """Start watching in a daemon thread."""
+        self._stop.clear()
+        fd = _inotify(self.paths) if self.inotify else None
+        self._thread = Thread(target=self._run, args=(fd,), name="cbs-reloader", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop watching, and wait for the thread to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _wait(self, fd):
+        """Wait for a change, or the interval. Returns ``True`` if worth checking."""
+        if fd is None:
+            return not self._stop.wait(self.interval)
+        ready, _, _ = select.select([fd], [], [], self.interval)
+        if not ready:
+            return False
+        try:
+            while os.read(fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def _run(self, fd):
+        try:
+            while not self._stop.is_set():
+                if not self._wait(fd):
+                    continue
+                try:
+                    self.check()
+                except Exception:
+                    log.exception("Failed to reload settings; keeping the current values.")
+        finally:
+            if fd is not None:
+                os.close(fd)
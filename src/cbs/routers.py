@@ -0,0 +1,60 @@
+"""Database routers to pair with :py:func:`cbs.urls.parse_dburl_set`."""
+
+import random
+from itertools import cycle
+
+__all__ = ["ReplicaRouter"]
+
+
+class ReplicaRouter:
+    """Sends reads to replica databases, and everything else to the primary.
+
+    Instances can be used directly in ``DATABASE_ROUTERS``.
+
+    :param list replicas: Aliases of the replica databases.
+    :param str primary: Alias of the primary database.
+    :param dict weights: Relative weight for each replica. If omitted, reads
+        are spread round-robin.
+    """
+
+    def __init__(self, replicas, primary="default", weights=None):
+        self.primary = primary
+        self.replicas = list(replicas) or [primary]
+        self.pool = {primary, *self.replicas}
+        if weights:
+            self.weights = [weights.get(alias, 1) for alias in self.replicas]
+        else:
+            self.weights = None
+            self._next = cycle(self.replicas).__next__
+
+    @classmethod
+    def from_databases(cls, databases, primary="default", weights=None):
+        """Create a router for all databases marked as a ``MIRROR`` of ``primary``.
+
+        :param dict databases: A Django ``DATABASES`` dict, such as from
+            :py:func:`cbs.urls.parse_dburl_set`.
+        """
+        replicas = [
+            alias
+            for alias, config in databases.items()
+            if config.get("TEST", {}).get("MIRROR") == primary
+        ]  # fmt: skip
+        return cls(replicas, primary=primary, weights=weights)
+
+    def db_for_read(self, model, **hints):  # noqa: ARG002
+        if self.weights:
+            return random.choices(self.replicas, self.weights)[0]  # noqa: S311
+        return self._next()
+
+    def db_for_write(self, model, **hints):  # noqa: ARG002
+        return self.primary
+
+    def allow_relation(self, obj1, obj2, **hints):  # noqa: ARG002
+        if obj1._state.db in self.pool and obj2._state.db in self.pool:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):  # noqa: ARG002
+        if db in self.pool:
+            return db == self.primary
+        return None
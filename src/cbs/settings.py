@@ -1,7 +1,16 @@
+import atexit
 import os
+import sys
 from functools import partial
+from threading import RLock
+from time import perf_counter
+from types import CoroutineType
 from warnings import warn
 
+from . import cast, tracking
+from .env import _AwaitCast, get_environ, snapshot
+from .env import env as env_property
+
 __all__ = ["BaseSettings"]
 
 
@@ -9,29 +18,336 @@ class Unset:
     pass
 
 
+# Saves creating a super() object on every setting lookup.
+_getattribute = object.__getattribute__
+
+
 class BaseSettings:
-    """Base class for env switchable settings configuration."""
+    """Base class for env switchable settings configuration.
+
+    Sub-classes may pass ``mode`` to give extra names to select them by, e.g.
+    ``class ProdSettings(Settings, mode="production")``.
+    """
 
-    __children = {}  # noqa: RUF012
+    # Mode name to sub-classes (including this class) selectable by it.
+    __modes = {}  # noqa: RUF012
+
+    # Names of all settings visible on this class, in definition order.
+    __settings = ()
 
     Unset = Unset
 
-    def __init_subclass__(cls, **kwargs):
-        cls.__children[cls.__name__] = cls
+    _cache = None
+    _locks = None
+    # Setting name to the Resolution recording what it used.
+    _graph = None
+
+    # Values of async getters, from aresolve.
+    _awaited = None
+
+    def __init_subclass__(cls, mode=(), **kwargs):
+        cls.__modes = {}
+        modes = {mode} if isinstance(mode, str) else set(mode)
+        if cls.__name__.endswith("Settings"):
+            modes.add(cls.__name__[: -len("Settings")])
+        for klass in cls.__mro__:
+            if issubclass(klass, BaseSettings):
+                for name in modes:
+                    klass.__register(name.lower(), cls)
+
+        settings = {}
+        for klass in reversed(cls.__mro__):
+            for name, value in vars(klass).items():
+                if not name.isupper():
+                    continue
+                if value is Unset:
+                    settings.pop(name, None)
+                else:
+                    settings[name] = None
+        cls.__settings = tuple(settings)
+
         super().__init_subclass__(**kwargs)
 
+    @classmethod
+    def __register(cls, mode, klass):
+        # A class with the same name from the same module replaces the old
+        # one, as happens on reload. Anything else makes the mode ambiguous.
+        found = [
+            other
+            for other in cls.__modes.get(mode, ())
+            if (other.__module__, other.__qualname__) != (klass.__module__, klass.__qualname__)
+        ]
+        found.append(klass)
+        cls.__modes[mode] = found
+
+    def __init__(self, cache=False):
+        if cache:
+            self.__enable_cache()
+
+    def __enable_cache(self):
+        self._cache = {}
+        self._locks = {}
+        self._graph = {}
+
     def __getattribute__(self, name):
-        val = super().__getattribute__(name)
+        if name.isupper():
+            cache = _getattribute(self, "_cache")
+            if cache is not None or tracking.profile is not None:
+                return _tracked(self, name, cache)
+
+        # Without a cache or profiling, there's nothing to record.
+        val = _getattribute(self, name)
         if val is Unset:
             raise AttributeError(name)
         if isinstance(val, partial):
             raise RuntimeError(f"{name} needs default or getter.")
         if name.isupper() and callable(val):
             val = val()
+        if isinstance(val, _AWAITABLE):
+            return _awaited(self, name, val)
         return val
 
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name.isupper():
+            self.invalidate(name)
+
+    def __delattr__(self, name):
+        super().__delattr__(name)
+        if name.isupper():
+            self.invalidate(name)
+
+    def invalidate(self, name=None):
+        """Discard cached values, so they are re-evaluated on next access.
+
+        Settings which used the value, directly or not, are discarded too.
+
+        Does nothing unless the instance was created with ``cache=True``.
+
+        :param str name: Name of the setting to discard. If omitted, all
+            cached values are discarded.
+        :return: set of the names discarded.
+        """
+        if self._cache is None:
+            return set()
+        if name is None:
+            names = set(self._cache)
+            self._cache.clear()
+            self._graph.clear()
+            return names
+        return self.__discard({name})
+
+    def invalidate_environ(self, *keys):
+        """Discard cached values which read any of these env vars.
+
+        Settings which used those values, directly or not, are discarded too.
+        Use this when the environment changes, so only the settings affected
+        are re-evaluated.
+
+        :param str keys: Names of env vars, e.g. ``"DATABASE_URL"``.
+        :return: set of the setting names discarded.
+        """
+        if self._cache is None:
+            return set()
+        return self.__discard(_reading(self._graph.copy(), keys))
+
+    def __discard(self, names):
+        """Discard ``names``, and everything depending on them, from the cache."""
+        names = _dependents(self._graph.copy(), names)
+        for name in names:
+            self._cache.pop(name, None)
+            self._graph.pop(name, None)
+        return names
+
+    def dependencies(self):
+        """Returns what each cached setting used when it was resolved.
+
+        Only recorded when the instance was created with ``cache=True``.
+
+        :return: dict of setting name to a dict of ``settings``, the names of
+            other settings it read, and ``environ``, the env vars ``env`` read.
+        """
+        if self._cache is None:
+            return {}
+        return {
+            name: {"settings": set(resolution.settings), "environ": set(resolution.environ)}
+            for name, resolution in self._graph.copy().items()
+        }
+
+    def refresh(self):
+        """Discard all cached values, and re-evaluate every setting."""
+        self.invalidate()
+        with snapshot():
+            for name in self.__settings:
+                getattr(self, name)
+
+    def prefork(self, mutable=("DATABASES", "CACHES", "LOGGING"), gc_freeze=True):
+        """Resolve every setting into immutable values, to share with forked workers.
+
+        Call this in the master process, before forking, e.g. with gunicorn's
+        ``preload_app``. Workers then start with every value cached, and the
+        memory holding them is shared until written to.
+
+        Values are made immutable with :py:func:`.cast.freeze`, so nothing
+        can change them in one worker and not the others.
+
+        This enables caching on the instance, if it wasn't already.
+
+        :param mutable: Names of settings to leave as they are. By default,
+            those Django changes in place.
+        :param bool gc_freeze: Call ``gc.freeze()`` afterwards, so that garbage
+            collection in workers doesn't write to, and so copy, every page
+            of objects created so far.
+        """
+        if self._cache is None:
+            self.__enable_cache()
+
+        self.refresh()
+        for name, value in list(self._cache.items()):
+            if name not in mutable:
+                self._cache[name] = cast.freeze(value)
+
+        if gc_freeze:
+            import gc
+
+            gc.collect()
+            gc.freeze()
+
+    async def aresolve(self, timeout=None):
+        """Await all ``async`` getters concurrently, and keep their values.
+
+        Settings with an ``async`` getter, either a method or an ``env``
+        decorated method, can only be accessed once this has been awaited.
+        Awaiting it again fetches them all again.
+
+        ``env`` settings whose env var is set don't call their getter.
+
+        :param float timeout: Seconds to wait for all getters to complete,
+            else ``TimeoutError`` is raised, and no values are kept.
+        """
+        import asyncio
+        from inspect import iscoroutinefunction
+
+        cls = type(self)
+        names = []
+        for name in self.__settings:
+            value = getattr(cls, name)
+            if isinstance(value, env_property):
+                value = value.getter
+            if iscoroutinefunction(value):
+                names.append(name)
+
+        # Record what each uses, as for any other cached setting.
+        resolutions = [tracking.Resolution(name) for name in names]
+        with snapshot():
+            pending = []
+            for name, resolution in zip(names, resolutions):
+                token = tracking.current.set(resolution)
+                try:
+                    pending.append(_resolve(self, name, awaitable=True))
+                finally:
+                    tracking.current.reset(token)
+            values = await asyncio.wait_for(asyncio.gather(*map(_awaitable, pending, resolutions)), timeout)
+
+        self._awaited = {**(self._awaited or {}), **dict(zip(names, values))}
+        if self._cache is not None:
+            self._cache.update(self._awaited)
+            self._graph.update(zip(names, resolutions))
+
+    def prefetch(self, workers=None):
+        """Resolve every setting now, using a pool of threads, and cache them.
+
+        Useful when several getters wait on I/O. A getter that uses another
+        setting waits for it to be resolved, once, by whichever thread got to
+        it first.
+
+        This enables caching on the instance, if it wasn't already. Settings
+        with ``async`` getters must have been resolved with ``aresolve``.
+
+        :param int workers: Number of threads to use. Defaults to that of
+            ``ThreadPoolExecutor``.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        from contextvars import copy_context
+
+        if self._cache is None:
+            self.__enable_cache()
+
+        with snapshot(), ThreadPoolExecutor(workers) as pool:
+            # Each task runs in a copy of this context, so sees the snapshot.
+            futures = [pool.submit(copy_context().run, getattr, self, name) for name in self.__settings]
+            for future in futures:
+                future.result()
+
+    def freeze(self, namespace=None):
+        """Resolve every setting once, and store the values in ``namespace``.
+
+        Names already present in ``namespace`` are left untouched, and a
+        warning is issued, just as ``dir_factory`` does.
+
+        :param dict namespace: Mapping to store values in.
+            Defaults to the globals of the module defining this class.
+        """
+        from inspect import getmodule
+
+        if namespace is None:
+            namespace = vars(getmodule(self.__class__))
+
+        class_settings = self.__settings
+
+        # Values from a previous freeze (e.g. on module reload) don't count.
+        previous = namespace.get("__frozen_settings__", ())
+        overlap = set(namespace).difference(previous).intersection(class_settings)
+
+        if overlap:
+            warn(f"Masked settings in {self.__class__.__name__}: {overlap}")
+
+        frozen = [name for name in class_settings if name not in overlap]
+        with snapshot():
+            for name in frozen:
+                namespace[name] = getattr(self, name)
+        namespace["__frozen_settings__"] = frozen
+
+    @staticmethod
+    def enable_profiling():
+        """Start recording how often, and for how long, each setting is resolved.
+
+        Can also be enabled by setting the ``CBS_PROFILE`` environment
+        variable, in which case a report is written to ``stderr`` on exit.
+        """
+        if tracking.profile is None:
+            tracking.profile = tracking.Profile()
+
+    @staticmethod
+    def disable_profiling():
+        """Stop recording, and discard any stats recorded."""
+        tracking.profile = None
+
+    @staticmethod
+    def profiling_stats():
+        """Returns the stats recorded since profiling was enabled.
+
+        :return: dict of setting name to a dict of ``count``, ``time`` (in
+            seconds, including resolving any settings it depends on), and
+            ``source``, which is one of ``"environ"``, ``"default"``,
+            ``"getter"`` or ``"value"``.
+        """
+        if tracking.profile is None:
+            return {}
+        with tracking.profile.lock:
+            return {name: dict(stat) for name, stat in tracking.profile.stats.items()}
+
+    @staticmethod
+    def profiling_report(file=None):
+        """Write a table of recorded stats, slowest first.
+
+        :param file: File to write to. Defaults to ``sys.stderr``.
+        """
+        if tracking.profile is not None:
+            tracking.profile.report(file)
+
     @classmethod
-    def use(cls, default="", env="DJANGO_MODE"):
+    def use(cls, default="", env="DJANGO_MODE", cache=False, freeze=False, *, prefetch=None, prefork=False):  # noqa: PLR0913
         """Helper for accessing sub-classes via env var name.
 
         Gets a sub-class instance using ``get_settings_instance``, and returns
@@ -39,40 +355,80 @@ class BaseSettings:
 
         :param str default: Default value for DJANGO_MODE if not set.
         :param str env: Envirionment variable to get settings mode name from.
+        :param bool cache: Resolve each setting only once, and remember the
+            value. See ``invalidate`` and ``refresh``.
+        :param bool freeze: Resolve every setting now, and store them in the
+            globals of the module calling ``use``. See ``freeze``.
+        :param int prefetch: Resolve every setting now, using this many
+            threads, and cache them. See ``prefetch``.
+        :param bool prefork: Resolve every setting now into immutable values,
+            ready for forked workers to share. See ``prefork``.
         :return: functions suitable for module-level ``__getattr__`` and
             ``__dir__``
         """
-        settings = cls.get_settings_instance(default, env)
+        with snapshot():
+            settings = cls.get_settings_instance(default, env)
+            if cache:
+                settings.__enable_cache()
+
+            if prefetch:
+                settings.prefetch(prefetch)
+
+            if prefork:
+                settings.prefork()
 
-        return (
-            settings.getattr_factory(),
-            settings.dir_factory(),
-        )
+            if freeze:
+                # The module calling use(), which may have imported the class.
+                namespace = sys._getframe(1).f_globals
+                settings.freeze(namespace)
+                return (
+                    settings.getattr_factory(),
+                    settings.frozen_dir_factory(namespace),
+                )
+
+            return (
+                settings.getattr_factory(),
+                settings.dir_factory(),
+            )
 
     @classmethod
-    def get_settings_instance(cls, default="", env="DJANGO_MODE"):
+    def get_settings_instance(cls, default="", env="DJANGO_MODE", **kwargs):
         """Create an instance of the appropriate Settings sub-class.
 
-        Takes the value of ``os.environ[env]``, calls ``.title()`` on it, then
-        appends `"Settings"`. If there is no value in ``os.environ``, it will
-        use ``default`` instead.
+        Takes the value of ``os.environ[env]`` (or the current ``snapshot``),
+        or ``default`` if it is not set, and finds the class for that mode
+        amongst this class and its sub-classes.
 
-        It will then find a sub-class of that name, and return an instance of
-        it.
+        A class named ``{Mode}Settings`` is found by ``mode``, ignoring case,
+        as is any class declaring it with ``mode=``.
+
+        It will return an instance of it, passing along any extra keyword
+        arguments.
         """
-        base = os.environ.get(env, default)
-        name = f"{base.title()}Settings"
+        base = get_environ().get(env, default)
 
         try:
-            return cls.__children[name]()
+            found = cls.__modes[base.lower()]
         except KeyError:
             raise ValueError(
-                f'Could not find Settings class for mode {base!r} ' f'(Known: {", ".join(cls.__children)})',
+                f"Could not find Settings class for mode {base!r} "
+                f"(Known: {', '.join(map(repr, sorted(cls.__modes)))})",
+            ) from None
+
+        if len(found) > 1:
+            raise ValueError(
+                f"Settings mode {base!r} is ambiguous: "
+                f"{', '.join(f'{klass.__module__}.{klass.__qualname__}' for klass in found)}. "
+                "Call use() on the base class of the one you want.",
             )
 
+        return found[0](**kwargs)
+
     def getattr_factory(self):
         """Returns a function to be used as __getattr__ in a module.
 
+        The settings instance is available as its ``settings`` attribute.
+
         :return: function suitable for module-level ``__getattr__``
         """
 
@@ -81,6 +437,8 @@ class BaseSettings:
                 raise AttributeError(key)
             return getattr(self, key)
 
+        __getattr__.settings = self
+
         return __getattr__
 
     def dir_factory(self):
@@ -88,16 +446,20 @@ class BaseSettings:
 
         :return: function suitable for module-level ``__dir__``
         """
-        from inspect import getmembers, getmodule
+        from inspect import getmodule
 
         pkg = getmodule(self.__class__)
 
-        class_settings = [
-            name
-            for name, value in getmembers(self)
-            if name.isupper()
-            and value is not Unset
-        ]  # fmt: skip
+        class_settings = list(self.__settings)
+
+        # Catch incomplete and missing required settings early, without
+        # resolving everything else.
+        for name in class_settings:
+            value = getattr(self.__class__, name)
+            if isinstance(value, partial):
+                raise RuntimeError(f"{name} needs default or getter.")
+            if isinstance(value, env_property) and value.required:
+                getattr(self, name)
 
         def __dir__():  # noqa: N807
             package_settings = [
@@ -114,3 +476,133 @@ class BaseSettings:
             return package_settings + class_settings
 
         return __dir__
+
+    def frozen_dir_factory(self, namespace=None):
+        """Returns a function to be used as __dir__ in a module after ``freeze``.
+
+        As all settings now live in the module, only it needs inspecting.
+
+        :param dict namespace: Globals of the module settings were frozen into.
+            Defaults to those of the module defining this class.
+        :return: function suitable for module-level ``__dir__``
+        """
+        from inspect import getmodule
+
+        if namespace is None:
+            namespace = vars(getmodule(self.__class__))
+
+        def __dir__():  # noqa: N807
+            return [
+                name
+                for name in namespace.keys()
+                if name.isupper()
+            ]  # fmt: skip
+
+        return __dir__
+
+
+def _reading(graph, keys):
+    """Returns the names of settings in ``graph`` which read any env var in ``keys``."""
+    keys = set(keys)
+    return {name for name, resolution in graph.items() if resolution.environ & keys}
+
+
+def _dependents(graph, names):
+    """Returns ``names``, and the names of all settings in ``graph`` depending on them."""
+    dependents = {}
+    for name, resolution in graph.items():
+        for dependency in resolution.settings:
+            dependents.setdefault(dependency, set()).add(name)
+
+    pending = list(names)
+    names = set(names)
+    while pending:
+        for name in dependents.get(pending.pop(), ()):
+            if name not in names:
+                names.add(name)
+                pending.append(name)
+    return names
+
+
+# What an async getter, or an env using one, returns.
+_AWAITABLE = (CoroutineType, _AwaitCast)
+
+
+def _tracked(settings, name, cache):
+    """Resolve a setting, recording what it uses, and caching it if ``cache`` isn't ``None``."""
+    # Record this as a dependency of the setting being resolved, if any.
+    parent = tracking.current.get()
+    if parent is not None:
+        parent.settings.add(name)
+    if cache is None:
+        return _evaluate(settings, name)
+    # A resolved value is never Unset, so it can mark a miss.
+    val = cache.get(name, Unset)
+    if val is not Unset:
+        return val
+    # Resolve each setting only once, even when many threads ask at once.
+    locks = settings._locks
+    lock = locks.get(name) or locks.setdefault(name, RLock())
+    with lock:
+        val = cache.get(name, Unset)
+        if val is Unset:
+            val = cache[name] = _evaluate(settings, name, settings._graph)
+    return val
+
+
+def _evaluate(settings, name, graph=None):
+    profile = tracking.profile
+    if graph is None and profile is None:
+        return _resolve(settings, name)
+
+    resolution = tracking.Resolution(name)
+    token = tracking.current.set(resolution)
+    start = perf_counter()
+    try:
+        val = _resolve(settings, name)
+    finally:
+        tracking.current.reset(token)
+        if profile is not None:
+            profile.record(resolution, perf_counter() - start)
+    if graph is not None:
+        graph[name] = resolution
+    return val
+
+
+def _resolve(settings, name, awaitable=False):
+    val = super(BaseSettings, settings).__getattribute__(name)
+    if val is Unset:
+        raise AttributeError(name)
+    if isinstance(val, partial):
+        raise RuntimeError(f"{name} needs default or getter.")
+    if name.isupper() and callable(val):
+        tracking.note_source("getter")
+        val = val()
+    if isinstance(val, _AWAITABLE) and not awaitable:
+        return _awaited(settings, name, val)
+    return val
+
+
+def _awaited(settings, name, val):
+    """Returns the value ``aresolve`` awaited for ``name``, in place of ``val``."""
+    val.close()
+    awaited = super(BaseSettings, settings).__getattribute__("_awaited")
+    if awaited is None or name not in awaited:
+        raise RuntimeError(f"{name} has an async getter; await aresolve() first.")
+    return awaited[name]
+
+
+async def _awaitable(value, resolution):
+    """Await ``value`` if it's from an async getter, else return it.
+
+    Runs as its own task, so ``resolution`` is only current for this setting.
+    """
+    tracking.current.set(resolution)
+    if isinstance(value, _AWAITABLE):
+        return await value
+    return value
+
+
+if os.environ.get("CBS_PROFILE"):
+    BaseSettings.enable_profiling()
+    atexit.register(BaseSettings.profiling_report)
@@ -0,0 +1,170 @@
+"""
+Sources of values for ``env``, other than ``os.environ``.
+
+Each source is a read-only ``Mapping`` of names to ``str`` values.
+
+File based sources are only read when first used, and are re-read only when
+the file's modification time changes.
+"""
+
+import os
+import re
+from collections.abc import Mapping
+from stat import S_ISREG
+
+__all__ = ["Chain", "DotEnv", "SecretsDir"]
+
+
+class Chain(Mapping):
+    """Looks up each key in several sources, in order, using the first found.
+
+    :param Mapping sources: Sources to consult, e.g. ``os.environ``.
+    """
+
+    def __init__(self, *sources):
+        self.sources = sources
+
+    def __getitem__(self, key):
+        for source in self.sources:
+            try:
+                return source[key]
+            except KeyError:  # noqa: PERF203
+                pass
+        raise KeyError(key)
+
+    def __iter__(self):
+        seen = set()
+        for source in self.sources:
+            for key in source:
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+def _stat(path):
+    try:
+        return os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+ESCAPES = {"n": "\n", "t": "\t"}
+
+# A quoted value, and any trailing comment.
+QUOTED = re.compile(r"""(?:'([^']*)'|"((?:[^"\\]|\\.)*)")\s*(?:#.*)?""")
+
+
+def _unquote(value):
+    match = QUOTED.fullmatch(value)
+    if match is not None:
+        if match[1] is not None:
+            return match[1]
+        return re.sub(r"\\(.)", lambda m: ESCAPES.get(m[1], m[1]), match[2])
+    # Allow trailing comments on unquoted values
+    return value.split(" #", 1)[0].rstrip()
+
+
+def parse_dotenv(text):
+    """Parse the contents of a ``.env`` file.
+
+    Supports blank lines, ``#`` comments, an optional ``export`` prefix, and
+    single or double quoted values.
+
+    :param str text: File contents.
+    :return: dict of names to values.
+    """
+    values = {}
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("export "):
+            line = line[7:].lstrip()
+        key, sep, value = line.partition("=")
+        if not sep:
+            continue
+        values[key.strip()] = _unquote(value.strip())
+    return values
+
+
+class DotEnv(Mapping):
+    """Values from a ``.env`` file.
+
+    A missing file is treated as empty.
+
+    :param str path: Path to the file.
+    """
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self._mtime = None
+        self._values = {}
+
+    def _load(self):
+        st = _stat(self.path)
+        mtime = None if st is None else st.st_mtime_ns
+        if mtime != self._mtime:
+            if mtime is None:
+                values = {}
+            else:
+                with open(self.path) as fin:
+                    values = parse_dotenv(fin.read())
+            self._values, self._mtime = values, mtime
+        return self._values
+
+    def __getitem__(self, key):
+        return self._load()[key]
+
+    def __iter__(self):
+        return iter(self._load())
+
+    def __len__(self):
+        return len(self._load())
+
+
+class SecretsDir(Mapping):
+    """Values from a directory of files, one per name.
+
+    This is how Docker and Kubernetes expose secrets, e.g. ``/run/secrets``.
+    Trailing newlines are stripped from values, and hidden files are ignored.
+
+    :param str path: Path to the directory.
+    """
+
+    def __init__(self, path="/run/secrets"):
+        self.path = os.fspath(path)
+        self._cache = {}
+
+    def __getitem__(self, key):
+        if key.startswith(".") or os.sep in key:
+            raise KeyError(key)
+        filename = os.path.join(self.path, key)
+        st = _stat(filename)
+        if st is None or not S_ISREG(st.st_mode):
+            self._cache.pop(key, None)
+            raise KeyError(key)
+        mtime = st.st_mtime_ns
+        try:
+            cached_mtime, value = self._cache[key]
+        except KeyError:
+            cached_mtime = None
+        if cached_mtime != mtime:
+            with open(filename) as fin:
+                value = fin.read().rstrip("\r\n")
+            self._cache[key] = (mtime, value)
+        return value
+
+    def __iter__(self):
+        try:
+            entries = list(os.scandir(self.path))
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            if not entry.name.startswith(".") and entry.is_file():
+                yield entry.name
+
+    def __len__(self):
+        return sum(1 for _ in self)
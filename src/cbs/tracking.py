@@ -0,0 +1,83 @@
+"""
+Instrumentation of settings resolution.
+
+While a setting is being resolved, a :py:class:`Resolution` is available from
+``current``, so ``env`` can report where the value came from, and which env
+vars and other settings were read.
+"""
+
+import sys
+from contextvars import ContextVar
+from threading import Lock
+
+current = ContextVar("cbs_resolution", default=None)
+
+# The active Profile, if profiling is enabled.
+profile = None
+
+
+class Resolution:
+    """Details of a single setting being resolved."""
+
+    __slots__ = ("environ", "name", "settings", "source")
+
+    def __init__(self, name):
+        self.name = name
+        self.source = None
+        # Names of other settings, and of env vars, read along the way.
+        self.settings = set()
+        self.environ = set()
+
+
+def note_source(source):
+    """Record where the value of the setting being resolved came from.
+
+    :param str source: One of ``"environ"``, ``"default"`` or ``"getter"``.
+        Settings with no source noted are reported as ``"value"``.
+    """
+    resolution = current.get()
+    if resolution is not None:
+        resolution.source = source
+
+
+def note_env(key, source):
+    """Record that the setting being resolved read env var ``key``.
+
+    :param str key: Name of the env var.
+    :param str source: As for :py:func:`note_source`.
+    """
+    resolution = current.get()
+    if resolution is not None:
+        resolution.source = source
+        resolution.environ.add(key)
+
+
+class Profile:
+    """Collects per-setting resolution counts and timings."""
+
+    def __init__(self):
+        self.stats = {}
+        self.lock = Lock()
+
+    def record(self, resolution, elapsed):
+        """Record a completed resolution.
+
+        :param Resolution resolution: The resolution.
+        :param float elapsed: Time taken, in seconds.
+        """
+        with self.lock:
+            stat = self.stats.setdefault(resolution.name, {"count": 0, "time": 0.0, "source": None})
+            stat["count"] += 1
+            stat["time"] += elapsed
+            stat["source"] = resolution.source or "value"
+
+    def report(self, file=None):
+        """Write a table of stats, slowest first.
+
+        :param file: File to write to. Defaults to ``sys.stderr``.
+        """
+        if file is None:
+            file = sys.stderr
+        print(f"{'Setting':40} {'Count':>7} {'Time (ms)':>12}  Source", file=file)
+        for name, stat in sorted(self.stats.items(), key=lambda item: item[1]["time"], reverse=True):
+            print(f"{name:40} {stat['count']:7d} {stat['time'] * 1000:12.3f}  {stat['source']}", file=file)
@@ -4,9 +4,29 @@ URL style config parsing.
 Inspired by dj_database_url
 """
 
-from urllib.parse import parse_qs, unquote, urlparse
+from functools import lru_cache, wraps
+from urllib.parse import parse_qs, unquote, urlparse, urlsplit
 
-from .cast import as_bool
+from .cast import as_bool, freeze
+
+# Number of distinct URLs each parser remembers the results for.
+CACHE_SIZE = 128
+
+REDIS_BACKEND = "django.core.cache.backends.redis.RedisCache"
+PYMEMCACHE_BACKEND = "django.core.cache.backends.memcached.PyMemcacheCache"
+PYLIBMC_BACKEND = "django.core.cache.backends.memcached.PyLibMCCache"
+
+BACKEND_MAP = {
+    "redis": REDIS_BACKEND,
+    "rediss": REDIS_BACKEND,
+    "memcached": PYMEMCACHE_BACKEND,
+    "pymemcache": PYMEMCACHE_BACKEND,
+    "pylibmc": PYLIBMC_BACKEND,
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "dbcache": "django.core.cache.backends.db.DatabaseCache",
+    "dummy": "django.core.cache.backends.dummy.DummyCache",
+}
 
 ENGINE_MAP = {
     "postgres": "django.db.backends.postgresql",
@@ -28,15 +48,115 @@ OPTS = {
     "COLLATION": str,
 }
 
+# Not "open": Django always passes that to ConnectionPool itself.
+POOL_OPTIONS = {
+    "min_size": int,
+    "max_size": int,
+    "max_waiting": int,
+    "num_workers": int,
+    "timeout": float,
+    "max_lifetime": float,
+    "max_idle": float,
+    "reconnect_timeout": float,
+    "name": str,
+}
+
+# Types of OPTIONS for each engine. A dict means a nested dict of options,
+# passed as e.g. ``?pool.max_size=10``, or enabled with ``?pool=true``.
+ENGINE_OPTIONS = {
+    "django.db.backends.postgresql": {
+        "pool": POOL_OPTIONS,
+        "server_side_binding": as_bool,
+        "connect_timeout": int,
+        "keepalives": int,
+        "keepalives_idle": int,
+        "keepalives_interval": int,
+        "keepalives_count": int,
+        "prepare_threshold": int,
+    },
+    "django.db.backends.mysql": {
+        "connect_timeout": int,
+        "read_timeout": int,
+        "write_timeout": int,
+        "autocommit": as_bool,
+        "local_infile": as_bool,
+    },
+    "django.db.backends.sqlite3": {
+        "timeout": float,
+        "check_same_thread": as_bool,
+        "uri": as_bool,
+    },
+}
+
+# SQLite PRAGMAs which can be passed directly, and are added to ``init_command``.
+SQLITE_PRAGMAS = {
+    "journal_mode",
+    "synchronous",
+    "busy_timeout",
+    "cache_size",
+    "foreign_keys",
+    "mmap_size",
+    "temp_store",
+    "wal_autocheckpoint",
+}
+
+
+def _copy(value):
+    if isinstance(value, dict):
+        return {key: _copy(val) for key, val in value.items()}
+    if isinstance(value, list):
+        return [_copy(val) for val in value]
+    return value
+
+
+def cached(func):
+    """Decorator to remember the results of a URL parser.
+
+    Results are kept in an LRU cache of ``CACHE_SIZE`` entries, keyed by URL.
+    Each call returns a copy, so callers can't alter the cached value.
+
+    The wrapped function gains ``cache_info()`` and ``cache_clear()`` from
+    :py:func:`functools.lru_cache`.
+
+    It also gains ``frozen(url)``, which returns the result made immutable
+    with :py:func:`.cast.freeze`. As that can't be altered, it isn't copied:
+    the same URL gives the same, hashable, object.
+    """
+    parse = lru_cache(maxsize=CACHE_SIZE)(func)
+
+    @wraps(func)
+    def wrapper(url):
+        return _copy(parse(url))
 
+    def frozen(url):
+        return freeze(parse(url))
+
+    # So it can be found again, e.g. by cbs.export
+    frozen.__qualname__ = f"{func.__qualname__}.frozen"
+    frozen = lru_cache(maxsize=CACHE_SIZE)(frozen)
+
+    def cache_clear():
+        parse.cache_clear()
+        frozen.cache_clear()
+
+    wrapper.cache_info = parse.cache_info
+    wrapper.cache_clear = cache_clear
+    wrapper.frozen = frozen
+
+    return wrapper
+
+
+@cached
 def parse_dburl(url: str) -> dict:
     """A light-weight implementation of dj_database_url
 
+    Results are cached; see :py:func:`cached`.
+
     :param str url: A db-url format string
 
     :return: A Django DATABASES compatible configuration dict.
-        Unknown keys in the querystring will be placed verbatim in the
-        ``OPTIONS`` sub-dict.
+        Unknown keys in the querystring will be placed in the ``OPTIONS``
+        sub-dict, cast according to ``ENGINE_OPTIONS`` where known.
     """
     url = urlparse(url)
 
@@ -69,7 +189,184 @@ def parse_dburl(url: str) -> dict:
         except KeyError:
             options[key] = values[0]
 
+    if options:
+        config["OPTIONS"] = _engine_options(config["ENGINE"], options)
+
+    return config
+
+
+def _engine_options(engine, options):
+    """Cast OPTIONS values according to ``ENGINE_OPTIONS``."""
+    schema = ENGINE_OPTIONS.get(engine, {})
+    result = {}
+    pragmas = []
+
+    for key, value in options.items():
+        name, _, sub = key.partition(".")
+        caster = schema.get(name, str)
+        if isinstance(caster, dict):
+            nested = result.get(name)
+            if sub:
+                if not isinstance(nested, dict):
+                    nested = result[name] = {}
+                nested[sub] = caster.get(sub, str)(value)
+            elif not isinstance(nested, dict):
+                result[name] = as_bool(value)
+        elif engine == "django.db.backends.sqlite3" and key in SQLITE_PRAGMAS:
+            pragmas.append(f"PRAGMA {key}={value}")
+        else:
+            result[key] = schema.get(key, str)(value)
+
+    if pragmas:
+        result["init_command"] = ";".join(filter(None, [result.get("init_command"), *pragmas]))
+
+    return result
+
+
+def parse_dburl_set(urls, defaults=None, primary="default", replica="replica", frozen=False) -> dict:
+    """Parse several db-urls into a Django DATABASES dict.
+
+    The first URL is the primary database. Each other URL is a read replica,
+    named ``{replica}_1``, ``{replica}_2``, etc. and marked as a ``MIRROR`` of
+    the primary for testing.
+
+    :param urls: A whitespace separated string of db-urls, or a list of them.
+    :param dict defaults: Values to apply to each entry that its URL doesn't
+        set, e.g. ``{"CONN_MAX_AGE": 60}``. ``OPTIONS`` are merged.
+    :param str primary: Alias for the primary database.
+    :param str replica: Prefix for replica database aliases.
+    :param bool frozen: Return the result made immutable with
+        :py:func:`.cast.freeze`.
+
+    :return: A Django DATABASES compatible dict.
+    """
+    if isinstance(urls, str):
+        urls = urls.split()
+    if not urls:
+        raise ValueError("At least one db-url is required.")
+
+    databases = {}
+
+    for idx, url in enumerate(urls):
+        config = parse_dburl(url)
+        for key, value in (defaults or {}).items():
+            if key == "OPTIONS":
+                config["OPTIONS"] = {**_copy(value), **config.get("OPTIONS", {})}
+            else:
+                config.setdefault(key, _copy(value))
+        if idx == 0:
+            databases[primary] = config
+        else:
+            config.setdefault("TEST", {"MIRROR": primary})
+            databases[f"{replica}_{idx}"] = config
+
+    if frozen:
+        return freeze(databases)
+    return databases
+
+
+def as_timeout(value: str):
+    """Cast a cache timeout, allowing ``"none"`` for no expiry."""
+    if value.strip().lower() == "none":
+        return None
+    return int(value)
+
+
+CACHE_OPTS = {
+    "TIMEOUT": as_timeout,
+    "KEY_PREFIX": str,
+    "KEY_FUNCTION": str,
+    "VERSION": int,
+}
+
+CACHE_OPTIONS = {
+    # Culling, for locmem, file and db backends
+    "MAX_ENTRIES": int,
+    "CULL_FREQUENCY": int,
+    # Redis connection pool
+    "db": int,
+    "max_connections": int,
+    "socket_timeout": float,
+    "socket_connect_timeout": float,
+    "socket_keepalive": as_bool,
+    "retry_on_timeout": as_bool,
+    "health_check_interval": int,
+    # pymemcache / pylibmc
+    "max_pool_size": int,
+    "pool_idle_timeout": int,
+    "connect_timeout": float,
+    "no_delay": as_bool,
+    "use_pooling": as_bool,
+    "binary": as_bool,
+}
+
+
+@cached
+def parse_cacheurl(url: str) -> dict:
+    """Parse a URL into a Django CACHES entry.
+
+    Supported schemes are ``redis``, ``rediss``, ``memcached`` (or
+    ``pymemcache``), ``pylibmc``, ``locmem``, ``file``, ``dbcache`` and
+    ``dummy``.
+
+    Several servers can be given separated by ``,``, for example
+    ``memcached://cache1:11211,cache2:11211``.
+
+    Results are cached; see :py:func:`cached`.
+
+    :param str url: A cache-url format string
+
+    :return: A Django CACHES compatible configuration dict.
+        ``TIMEOUT``, ``KEY_PREFIX``, ``KEY_FUNCTION`` and ``VERSION`` in the
+        querystring are set on the entry; all other keys are placed in the
+        ``OPTIONS`` sub-dict, cast to the right type where known.
+    """
+    url = urlsplit(url)
+
+    config = {
+        "BACKEND": BACKEND_MAP.get(url.scheme, url.scheme),
+    }
+
+    location = _cache_location(url)
+    if len(location) == 1:
+        config["LOCATION"] = location[0]
+    elif location:
+        config["LOCATION"] = location
+
+    options = {}
+
+    for key, values in parse_qs(url.query).items():
+        _key = key.upper()
+        if _key in CACHE_OPTS:
+            config[_key] = CACHE_OPTS[_key](values[0])
+        elif _key in CACHE_OPTIONS:
+            options[_key] = CACHE_OPTIONS[_key](values[0])
+        else:
+            options[key] = CACHE_OPTIONS.get(key, str)(values[0])
+
     if options:
         config["OPTIONS"] = options
 
     return config
+
+
+def _cache_location(url):
+    scheme = url.scheme
+    path = unquote(url.path)
+
+    userinfo, _, hosts = url.netloc.rpartition("@")
+    hosts = [host for host in hosts.split(",") if host]
+
+    if scheme in {"redis", "rediss"}:
+        prefix = f"{scheme}://{userinfo}@" if userinfo else f"{scheme}://"
+        return [f"{prefix}{host}{url.path}" for host in hosts]
+    if scheme in {"memcached", "pymemcache", "pylibmc"}:
+        if hosts:
+            return hosts
+        # Unix socket
+        return [path if scheme == "pylibmc" else f"unix:{path}"]
+    if scheme == "file":
+        return [path]
+    if scheme in {"locmem", "dbcache"}:
+        return hosts
+    return []
@@ -1,2 +1,2 @@
-# This must be external to __init__ as it pulls in bits that depend on django
+# Kept apart from __init__ so the version can be read without importing cbs
 __version__ = "3.0.7"
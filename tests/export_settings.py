@@ -0,0 +1,37 @@
+# File for testing cbs.export
+from pathlib import Path
+
+from cbs import BaseSettings, env
+
+BASE_DIR = Path("/srv/app")
+
+
+class ExportSettings(BaseSettings):
+    DEBUG = True
+
+    ALLOWED_HOSTS = env.list("localhost")
+
+    PORT = env.int(8000)
+
+    SERVER_NAME = env("localhost")
+
+    REDIS = env.group(HOST="localhost", PORT=env.int(6379))
+
+    @env.bool
+    def SSL(self):
+        return not self.DEBUG
+
+    def DATABASES(self):
+        return {"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": str(BASE_DIR / "db.sqlite")}}
+
+    def STATICFILES_DIRS(self):
+        return (BASE_DIR / "static",)
+
+
+class ExportLiveSettings(ExportSettings):
+    DEBUG = False
+
+    SERVER_NAME = env(env.Required)
+
+
+__getattr__, __dir__ = ExportSettings.use(default="export")
@@ -0,0 +1,19 @@
+# File for testing BaseSettings.use(freeze=True)
+from cbs import BaseSettings, env
+
+MASKED = "global"
+
+
+class FrozenSettings(BaseSettings):
+    calls = 0
+
+    MASKED = "local"
+
+    IMMEDIATE_INT = env.int(5432)
+
+    def METHOD(self):
+        self.calls += 1
+        return self.calls
+
+
+__getattr__, __dir__ = BaseSettings.use(default="frozen", env="FROZEN_MODE", freeze=True)
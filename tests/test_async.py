@@ -0,0 +1,112 @@
+import asyncio
+import os
+import time
+import unittest
+
+from cbs import BaseSettings, env
+
+DELAY = 0.1
+
+
+class AsyncSettings(BaseSettings):
+    DEBUG = True
+
+    @env
+    async def REMOTE_URL(self):
+        await asyncio.sleep(DELAY)
+        return "https://config.example.com"
+
+    @env.int
+    async def REMOTE_PORT(self):
+        await asyncio.sleep(DELAY)
+        return "8443"
+
+    @env(frozen=True)
+    async def REMOTE_TAGS(self):
+        await asyncio.sleep(DELAY)
+        return ["a", "b"]
+
+    async def ALLOWLIST(self):
+        await asyncio.sleep(DELAY)
+        return ["10.0.0.1"]
+
+    def ENDPOINT(self):
+        return f"{self.REMOTE_URL}:{self.REMOTE_PORT}"
+
+
+class SlowAsyncSettings(BaseSettings):
+    async def NEVER(self):
+        await asyncio.sleep(10)
+
+
+class TestAsync(unittest.TestCase):
+    def setUp(self):
+        os.environ.clear()
+
+    def test_aresolve(self):
+        settings = AsyncSettings()
+
+        start = time.perf_counter()
+        asyncio.run(settings.aresolve())
+        elapsed = time.perf_counter() - start
+
+        # Getters run concurrently
+        self.assertLess(elapsed, DELAY * 2)
+
+        self.assertEqual(settings.REMOTE_URL, "https://config.example.com")
+        self.assertEqual(settings.REMOTE_PORT, 8443)
+        self.assertEqual(settings.ALLOWLIST, ["10.0.0.1"])
+        self.assertEqual(settings.REMOTE_TAGS, ("a", "b"))
+        self.assertEqual(settings.ENDPOINT, "https://config.example.com:8443")
+
+    def test_env(self):
+        os.environ["REMOTE_PORT"] = "443"
+        settings = AsyncSettings()
+
+        asyncio.run(settings.aresolve())
+
+        self.assertEqual(settings.REMOTE_PORT, 443)
+
+        # The env var still takes precedence
+        os.environ["REMOTE_PORT"] = "444"
+        self.assertEqual(settings.REMOTE_PORT, 444)
+
+    def test_not_resolved(self):
+        settings = AsyncSettings()
+
+        self.assertTrue(settings.DEBUG)
+        with self.assertRaisesRegex(RuntimeError, "aresolve"):
+            settings.REMOTE_URL
+        with self.assertRaisesRegex(RuntimeError, "aresolve"):
+            settings.ENDPOINT
+
+    def test_cached(self):
+        settings = AsyncSettings(cache=True)
+
+        asyncio.run(settings.aresolve())
+
+        self.assertEqual(settings._cache["ALLOWLIST"], ["10.0.0.1"])
+
+        settings.refresh()
+        self.assertEqual(settings._cache["ENDPOINT"], "https://config.example.com:8443")
+
+    def test_dependencies(self):
+        settings = AsyncSettings(cache=True)
+
+        asyncio.run(settings.aresolve())
+        settings.ENDPOINT
+
+        self.assertEqual(settings.dependencies()["REMOTE_PORT"], {"settings": set(), "environ": {"REMOTE_PORT"}})
+
+        os.environ["REMOTE_PORT"] = "443"
+        self.assertEqual(settings.invalidate_environ("REMOTE_PORT"), {"REMOTE_PORT", "ENDPOINT"})
+        self.assertEqual(settings.ENDPOINT, "https://config.example.com:443")
+
+    def test_timeout(self):
+        settings = SlowAsyncSettings()
+
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(settings.aresolve(timeout=DELAY))
+
+        with self.assertRaises(RuntimeError):
+            settings.NEVER
@@ -0,0 +1,347 @@
+import asyncio
+import os
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from cbs import BaseSettings, env
+from cbs.cast import frozendict
+from cbs.env import snapshot
+
+
+class CountingSettings(BaseSettings):
+    calls = 0
+
+    PLAIN = "plain"
+
+    ENV_INT = env.int(1)
+
+    def METHOD(self):
+        self.calls += 1
+        return self.calls
+
+    def NESTED(self):
+        return self.METHOD
+
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        os.environ.clear()
+
+    def test_uncached(self):
+        settings = CountingSettings()
+
+        self.assertEqual(settings.METHOD, 1)
+        self.assertEqual(settings.METHOD, 2)
+
+    def test_cached(self):
+        settings = CountingSettings(cache=True)
+
+        self.assertEqual(settings.METHOD, 1)
+        self.assertEqual(settings.METHOD, 1)
+        self.assertEqual(settings.NESTED, 1)
+
+    def test_cached_env(self):
+        settings = CountingSettings(cache=True)
+
+        self.assertEqual(settings.ENV_INT, 1)
+
+        os.environ["ENV_INT"] = "2"
+        self.assertEqual(settings.ENV_INT, 1)
+
+    def test_invalidate(self):
+        settings = CountingSettings(cache=True)
+        settings.ENV_INT
+        settings.METHOD
+
+        os.environ["ENV_INT"] = "2"
+        settings.invalidate("ENV_INT")
+
+        self.assertEqual(settings.ENV_INT, 2)
+        self.assertEqual(settings.METHOD, 1)
+
+        settings.invalidate()
+        self.assertEqual(settings.METHOD, 2)
+
+    def test_invalidate_uncached(self):
+        settings = CountingSettings()
+
+        settings.invalidate()
+        settings.invalidate("METHOD")
+
+    def test_refresh(self):
+        settings = CountingSettings(cache=True)
+        self.assertEqual(settings.METHOD, 1)
+
+        os.environ["ENV_INT"] = "3"
+        settings.refresh()
+
+        self.assertEqual(settings._cache["METHOD"], 2)
+        self.assertEqual(settings._cache["ENV_INT"], 3)
+        self.assertEqual(settings._cache["PLAIN"], "plain")
+
+
+class SlowSettings(BaseSettings):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = {}
+        self.lock = threading.Lock()
+
+    def count(self, name):
+        with self.lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+        # Give other threads every chance to get in.
+        time.sleep(0.01)
+
+    @env.int
+    def SLOW_ENV(self):
+        self.count("SLOW_ENV")
+        return 1
+
+    def SLOW(self):
+        self.count("SLOW")
+        return self.SLOW_ENV + 1
+
+
+class TestConcurrency(unittest.TestCase):
+    THREADS = 32
+
+    def setUp(self):
+        os.environ.clear()
+
+    def test_threads(self):
+        settings = SlowSettings(cache=True)
+        barrier = threading.Barrier(self.THREADS)
+
+        def access(n):
+            barrier.wait()
+            return settings.SLOW if n % 2 else settings.SLOW_ENV
+
+        with ThreadPoolExecutor(self.THREADS) as pool:
+            results = list(pool.map(access, range(self.THREADS)))
+
+        self.assertEqual(set(results), {1, 2})
+        self.assertEqual(settings.calls, {"SLOW": 1, "SLOW_ENV": 1})
+
+    def test_asyncio(self):
+        settings = SlowSettings(cache=True)
+
+        async def task():
+            await asyncio.sleep(0)
+            return settings.SLOW
+
+        async def access():
+            loop = asyncio.get_running_loop()
+            return await asyncio.gather(
+                *(loop.run_in_executor(None, getattr, settings, "SLOW") for _ in range(self.THREADS)),
+                *(task() for _ in range(self.THREADS)),
+            )
+
+        results = asyncio.run(access())
+
+        self.assertEqual(set(results), {2})
+        self.assertEqual(settings.calls, {"SLOW": 1, "SLOW_ENV": 1})
+
+    def test_invalidate(self):
+        """Invalidating while other threads read never yields a missing value."""
+        settings = SlowSettings(cache=True)
+        stop = threading.Event()
+
+        def invalidate():
+            while not stop.is_set():
+                settings.invalidate()
+
+        thread = threading.Thread(target=invalidate)
+        thread.start()
+        try:
+            with ThreadPoolExecutor(8) as pool:
+                results = list(pool.map(lambda _: settings.SLOW, range(64)))
+        finally:
+            stop.set()
+            thread.join()
+
+        self.assertEqual(set(results), {2})
+
+
+class PrefetchSettings(BaseSettings):
+    DELAY = 0.1
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.threads = set()
+
+    def io(self, value):
+        self.threads.add(threading.get_ident())
+        time.sleep(self.DELAY)
+        return value
+
+    @env
+    def CERTIFICATE(self):
+        return self.io("certificate")
+
+    def ALLOWLIST(self):
+        return self.io(["10.0.0.1"])
+
+    def HOSTS(self):
+        return self.io(["example.com"])
+
+    def SSL(self):
+        # Depends on another slow setting
+        return self.io(bool(self.CERTIFICATE))
+
+
+class TestPrefetch(unittest.TestCase):
+    def setUp(self):
+        os.environ.clear()
+
+    def test_prefetch(self):
+        settings = PrefetchSettings()
+
+        start = time.perf_counter()
+        settings.prefetch(workers=4)
+        elapsed = time.perf_counter() - start
+
+        # SSL waits for CERTIFICATE, but nothing else waits.
+        self.assertLess(elapsed, PrefetchSettings.DELAY * 3)
+        self.assertGreater(len(settings.threads), 1)
+
+        self.assertEqual(
+            settings._cache,
+            {
+                "DELAY": 0.1,
+                "CERTIFICATE": "certificate",
+                "ALLOWLIST": ["10.0.0.1"],
+                "HOSTS": ["example.com"],
+                "SSL": True,
+            },
+        )
+
+    def test_snapshot(self):
+        """Worker threads read the caller's snapshot."""
+        settings = PrefetchSettings()
+
+        with snapshot({"CERTIFICATE": ""}):
+            settings.prefetch(workers=2)
+
+        self.assertEqual(settings.CERTIFICATE, "")
+        self.assertIs(settings.SSL, False)
+
+
+class GraphSettings(BaseSettings):
+    HOST = env("localhost")
+
+    PORT = env.int(80)
+
+    DEBUG = False
+
+    def URL(self):
+        return f"http://{self.HOST}:{self.PORT}"
+
+    def API(self):
+        return f"{self.URL}/api"
+
+    def LOGGING(self):
+        return {"level": "DEBUG" if self.DEBUG else "INFO"}
+
+
+class TestDependencies(unittest.TestCase):
+    def setUp(self):
+        os.environ.clear()
+
+    def test_graph(self):
+        settings = GraphSettings(cache=True)
+        settings.API
+        settings.LOGGING
+
+        self.assertEqual(
+            settings.dependencies(),
+            {
+                "API": {"settings": {"URL"}, "environ": set()},
+                "URL": {"settings": {"HOST", "PORT"}, "environ": set()},
+                "HOST": {"settings": set(), "environ": {"HOST"}},
+                "PORT": {"settings": set(), "environ": {"PORT"}},
+                "LOGGING": {"settings": {"DEBUG"}, "environ": set()},
+                "DEBUG": {"settings": set(), "environ": set()},
+            },
+        )
+
+    def test_uncached(self):
+        settings = GraphSettings()
+        settings.API
+
+        self.assertEqual(settings.dependencies(), {})
+
+    def test_invalidate(self):
+        settings = GraphSettings(cache=True)
+        settings.API
+        settings.LOGGING
+
+        self.assertEqual(settings.invalidate("URL"), {"URL", "API"})
+        self.assertEqual(set(settings._cache), {"HOST", "PORT", "LOGGING", "DEBUG"})
+
+    def test_invalidate_environ(self):
+        settings = GraphSettings(cache=True)
+        self.assertEqual(settings.API, "http://localhost:80/api")
+        settings.LOGGING
+
+        os.environ["PORT"] = "8000"
+        self.assertEqual(settings.invalidate_environ("PORT", "UNUSED"), {"PORT", "URL", "API"})
+        self.assertEqual(set(settings._cache), {"HOST", "LOGGING", "DEBUG"})
+
+        self.assertEqual(settings.API, "http://localhost:8000/api")
+
+    def test_override(self):
+        settings = GraphSettings(cache=True)
+        settings.API
+        settings.LOGGING
+
+        settings.HOST = "example.com"
+        self.assertEqual(settings.API, "http://example.com:80/api")
+        self.assertEqual(settings.LOGGING, {"level": "INFO"})
+
+        settings.DEBUG = True
+        self.assertEqual(settings.LOGGING, {"level": "DEBUG"})
+
+        del settings.HOST
+        self.assertEqual(settings.API, "http://localhost:80/api")
+
+
+class PreforkSettings(BaseSettings):
+    ALLOWED_HOSTS = env.list("localhost")
+
+    def DATABASES(self):
+        return {"default": {"ENGINE": "django.db.backends.sqlite3"}}
+
+    def ALLOWLIST(self):
+        return {"networks": ["10.0.0.0/8"], "hosts": {"example.com"}}
+
+
+class TestPrefork(unittest.TestCase):
+    def setUp(self):
+        os.environ.clear()
+
+    @mock.patch("gc.freeze")
+    def test_prefork(self, gc_freeze):
+        settings = PreforkSettings()
+
+        settings.prefork()
+
+        gc_freeze.assert_called_once_with()
+        self.assertEqual(set(settings._cache), {"ALLOWED_HOSTS", "DATABASES", "ALLOWLIST"})
+        self.assertEqual(settings.ALLOWED_HOSTS, ("localhost",))
+        self.assertEqual(settings.ALLOWLIST, {"networks": ("10.0.0.0/8",), "hosts": frozenset({"example.com"})})
+        self.assertIsInstance(settings.ALLOWLIST, frozendict)
+
+        # Django changes DATABASES in place
+        self.assertNotIsInstance(settings.DATABASES, frozendict)
+
+    @mock.patch("gc.freeze")
+    def test_mutable(self, gc_freeze):
+        settings = PreforkSettings(cache=True)
+
+        settings.prefork(mutable=(), gc_freeze=False)
+
+        gc_freeze.assert_not_called()
+        self.assertIsInstance(settings.DATABASES, frozendict)
@@ -1,6 +1,24 @@
+import copy
+import pickle
 import unittest
+from collections import namedtuple
+from datetime import timedelta
 
-from cbs.cast import as_bool, as_list, as_tuple
+from cbs.cast import (
+    as_bool,
+    as_bytesize,
+    as_dict,
+    as_duration,
+    as_json,
+    as_list,
+    as_timedelta,
+    as_tuple,
+    freeze,
+    frozendict,
+    list_of,
+    set_of,
+    tuple_of,
+)
 
 
 class UtilsEnv(unittest.TestCase):
@@ -46,3 +64,152 @@ class UtilsEnv(unittest.TestCase):
         )
         for given, expected in values:
             self.assertEqual(as_tuple(given), expected)
+
+    def test_list_of(self):
+        self.assertEqual(list_of()("a, b,,c "), ["a", "b", "c"])
+        self.assertEqual(list_of(int)("1, 2,,3 "), [1, 2, 3])
+        self.assertEqual(list_of(float, sep=";")("1.5; 2"), [1.5, 2.0])
+        self.assertEqual(list_of(int)([1]), [1])
+
+    def test_list_of_memoized(self):
+        self.assertIs(list_of(int), list_of(int))
+        self.assertIsNot(list_of(int), list_of(int, ";"))
+
+    def test_tuple_of(self):
+        self.assertEqual(tuple_of()("a, b,,c "), ("a", "b", "c"))
+        self.assertEqual(tuple_of(int, sep=":")("1:2"), (1, 2))
+        self.assertEqual(tuple_of(int)((1,)), (1,))
+        self.assertIs(tuple_of(int), tuple_of(int))
+
+    def test_set_of(self):
+        self.assertEqual(set_of()("a, b,,a "), frozenset({"a", "b"}))
+        self.assertEqual(set_of(int, sep=":")("1:2"), frozenset({1, 2}))
+        self.assertIs(set_of(int), set_of(int))
+
+
+class TestFrozen(unittest.TestCase):
+    def test_frozendict(self):
+        value = frozendict(a=1, b=(2, 3))
+
+        self.assertIsInstance(value, dict)
+        self.assertEqual(value, {"a": 1, "b": (2, 3)})
+        self.assertEqual(hash(value), hash(frozendict(b=(2, 3), a=1)))
+        self.assertEqual(repr(value), "frozendict({'a': 1, 'b': (2, 3)})")
+
+        for mutate in (
+            lambda: value.__setitem__("a", 2),
+            lambda: value.__delitem__("a"),
+            lambda: value.update(a=2),
+            lambda: value.setdefault("c", 3),
+            lambda: value.pop("a"),
+            value.popitem,
+            value.clear,
+        ):
+            with self.subTest(mutate=mutate), self.assertRaises(TypeError):
+                mutate()
+
+        copied = value.copy()
+        copied["a"] = 2
+        self.assertEqual(value["a"], 1)
+
+        for clone in (pickle.loads(pickle.dumps(value)), copy.deepcopy(value)):  # noqa: S301
+            self.assertIsInstance(clone, frozendict)
+            self.assertEqual(clone, value)
+
+    def test_freeze(self):
+        Point = namedtuple("Point", "x y")
+        value = freeze(
+            {
+                "list": [1, [2, 3]],
+                "set": {4},
+                "dict": {"nested": {"list": []}},
+                "point": Point([1], 2),
+                "str": "string",
+            },
+        )
+
+        self.assertEqual(
+            value,
+            {
+                "list": (1, (2, 3)),
+                "set": frozenset({4}),
+                "dict": {"nested": {"list": ()}},
+                "point": Point((1,), 2),
+                "str": "string",
+            },
+        )
+        self.assertIsInstance(value, frozendict)
+        self.assertIsInstance(value["dict"]["nested"], frozendict)
+        self.assertIsInstance(value["point"], Point)
+        hash(value)
+
+    def test_freeze_frozen(self):
+        value = freeze({"a": ("b", "c")})
+
+        self.assertIs(freeze(value), value)
+        self.assertIs(freeze(value["a"]), value["a"])
+
+
+class TestStructured(unittest.TestCase):
+    def test_as_json(self):
+        value = as_json('{"flags": ["a", "b"], "routes": {"/": 1}}')
+
+        self.assertEqual(value, {"flags": ("a", "b"), "routes": {"/": 1}})
+        self.assertIsInstance(value, frozendict)
+        self.assertIs(as_json('{"flags": ["a", "b"], "routes": {"/": 1}}'), value)
+
+        with self.assertRaises(ValueError):
+            as_json("{")
+
+        self.assertEqual(as_json({"a": [1]}), {"a": [1]})
+
+    def test_as_dict(self):
+        self.assertEqual(as_dict("a=1, b = x=y,"), {"a": "1", "b": "x=y"})
+        self.assertEqual(as_dict(""), {})
+        self.assertIsInstance(as_dict("a=1"), frozendict)
+        self.assertEqual(as_dict({"a": "1"}), {"a": "1"})
+
+        with self.assertRaises(ValueError):
+            as_dict("a=1,b")
+
+    def test_as_duration(self):
+        for given, expected in (
+            ("30", 30),
+            ("2.5", 2.5),
+            ("30s", 30),
+            (" 5m ", 300),
+            ("1h 30m", 5400),
+            ("500ms", 0.5),
+            ("1.5d", 129600),
+            ("1w", 604800),
+            (10, 10),
+        ):
+            with self.subTest(given=given):
+                self.assertEqual(as_duration(given), expected)
+
+        self.assertIs(as_duration(True), True)
+
+        for given in ("", "5x", "m", "1h x", "nan", "inf", "-Infinity", "1e400"):
+            with self.subTest(given=given), self.assertRaises(ValueError):
+                as_duration(given)
+
+    def test_as_timedelta(self):
+        self.assertEqual(as_timedelta("1h30m"), timedelta(hours=1, minutes=30))
+        self.assertEqual(as_timedelta(timedelta(seconds=1)), timedelta(seconds=1))
+
+    def test_as_bytesize(self):
+        for given, expected in (
+            ("100", 100),
+            ("100B", 100),
+            ("64MB", 64_000_000),
+            ("64 MiB", 64 * 1024**2),
+            ("512k", 512 * 1024),
+            ("1.5GiB", 1536 * 1024**2),
+            (42, 42),
+        ):
+            with self.subTest(given=given):
+                self.assertEqual(as_bytesize(given), expected)
+
+        for given in ("", "MB", "64XB", "-1"):
+            with self.subTest(given=given), self.assertRaises(ValueError):
+                as_bytesize(given)
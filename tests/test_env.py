@@ -1,7 +1,10 @@
 import os
+import pickle
 import unittest
+from datetime import timedelta
 
 from cbs import env
+from cbs.env import get_environ, snapshot
 
 
 class EnvTestCase(unittest.TestCase):
@@ -25,6 +28,23 @@ class TestProperty(EnvTestCase):
 
         self.assertIs(Settings.ENV, _env)
 
+    def test_slots(self):
+        """env instances, including prefixed ones, don't carry a __dict__."""
+        for value in (env("value"), env["DJANGO_"]("value"), env.dburls("sqlite://")):
+            with self.subTest(value=value):
+                self.assertFalse(hasattr(value, "__dict__"))
+
+    def test_env_name(self):
+        _env = env("value", prefix="PREFIX_")
+
+        class Settings:
+            ENV = _env
+
+        self.assertEqual(_env.env_name, "PREFIX_ENV")
+
+        _env.key = "OTHER"
+        self.assertEqual(_env.env_name, "PREFIX_OTHER")
+
 
 class TestPartial(EnvTestCase):
     def test_prefix(self):
@@ -301,6 +321,30 @@ class EnvListTest(EnvTestCase):
 
         self.assertEqual(Settings().SETTING, ["one", "two"])
 
+    def test_item(self):
+        class Settings:
+            SETTING = env.list("1, 2", item=int)
+
+        self.assertEqual(Settings().SETTING, [1, 2])
+
+    def test_item_sep(self):
+        class Settings:
+            SETTING = env.list([], item=int, sep=";")
+
+        os.environ["SETTING"] = "3; 4"
+        self.assertEqual(Settings().SETTING, [3, 4])
+
+    def test_decorator(self):
+        class Settings:
+            @env.list(item=int)
+            def SETTING(self):
+                return [1]
+
+        self.assertEqual(Settings().SETTING, [1])
+
+        os.environ["SETTING"] = "2,3"
+        self.assertEqual(Settings().SETTING, [2, 3])
+
 
 class EnvTupleTest(EnvTestCase):
     def test_immediate(self):
@@ -333,3 +377,225 @@ class EnvTupleTest(EnvTestCase):
                 "two",
             ),
         )
+
+    def test_item(self):
+        class Settings:
+            SETTING = env.tuple((), item=float)
+
+        os.environ["SETTING"] = "1.5, 2"
+
+        self.assertEqual(Settings().SETTING, (1.5, 2.0))
+
+
+class SnapshotTest(EnvTestCase):
+    def test_snapshot(self):
+        class Settings:
+            SETTING = env("default")
+
+        s = Settings()
+
+        os.environ["SETTING"] = "before"
+        with snapshot():
+            os.environ["SETTING"] = "after"
+            self.assertEqual(s.SETTING, "before")
+
+            # Nested snapshots share the outer copy
+            with snapshot():
+                self.assertEqual(s.SETTING, "before")
+
+        self.assertEqual(s.SETTING, "after")
+
+    def test_mapping(self):
+        class Settings:
+            SETTING = env("default")
+
+        os.environ["SETTING"] = "environ"
+        with snapshot({"SETTING": "mapping"}):
+            self.assertEqual(get_environ(), {"SETTING": "mapping"})
+            self.assertEqual(Settings().SETTING, "mapping")
+
+        with snapshot({}):
+            self.assertEqual(Settings().SETTING, "default")
+
+        self.assertIs(get_environ(), os.environ)
+
+
+class EnvCacheUrlTest(EnvTestCase):
+    def test_override(self):
+        class Settings:
+            SETTING = env.cacheurl("locmem://")
+
+        self.assertEqual(Settings().SETTING, {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"})
+
+        os.environ["SETTING"] = "redis://localhost:6379"
+        self.assertEqual(
+            Settings().SETTING,
+            {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": "redis://localhost:6379",
+            },
+        )
+
+
+class EnvDbUrlsTest(EnvTestCase):
+    def test_delimited(self):
+        class Settings:
+            DATABASES = env.dburls("sqlite:///db.sqlite", defaults={"CONN_MAX_AGE": 60})
+
+        self.assertEqual(
+            Settings().DATABASES,
+            {"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": "db.sqlite", "CONN_MAX_AGE": 60}},
+        )
+
+        os.environ["DATABASES"] = "postgres://primary/app postgres://replica/app"
+        self.assertEqual(list(Settings().DATABASES), ["default", "replica_1"])
+
+    def test_indexed(self):
+        denv = env["DJANGO_"]
+
+        class Settings:
+            DATABASES = denv.dburls(env.Required, key="DATABASE_URL")
+
+        os.environ["DJANGO_DATABASE_URL_10"] = "postgres://replica2/app"
+        os.environ["DJANGO_DATABASE_URL_0"] = "postgres://primary/app"
+        os.environ["DJANGO_DATABASE_URL_2"] = "postgres://replica1/app"
+        os.environ["DJANGO_DATABASE_URL_X"] = "postgres://ignored/app"
+
+        databases = Settings().DATABASES
+
+        self.assertEqual(
+            {alias: config["HOST"] for alias, config in databases.items()},
+            {"default": "primary", "replica_1": "replica1", "replica_2": "replica2"},
+        )
+
+    def test_required(self):
+        class Settings:
+            DATABASES = env.dburls(env.Required)
+
+        with self.assertRaises(ValueError):
+            Settings().DATABASES
+
+
+class EnvStructuredTest(EnvTestCase):
+    def test_helpers(self):
+        class Settings:
+            FLAGS = env.json("{}")
+            LABELS = env.dict("")
+            TIMEOUT = env.duration("30s")
+            SESSION_AGE = env.duration("2w", timedelta=True)
+            MAX_UPLOAD = env.bytesize("2.5MB")
+
+        os.environ["FLAGS"] = '{"beta": true}'
+        os.environ["LABELS"] = "team=core,tier=web"
+
+        s = Settings()
+        self.assertEqual(s.FLAGS, {"beta": True})
+        self.assertIs(s.FLAGS, s.FLAGS)
+        self.assertEqual(s.LABELS, {"team": "core", "tier": "web"})
+        self.assertEqual(s.TIMEOUT, 30)
+        self.assertEqual(s.SESSION_AGE, timedelta(weeks=2))
+        self.assertEqual(s.MAX_UPLOAD, 2_500_000)
+
+
+class EnvFrozenTest(EnvTestCase):
+    def test_helpers(self):
+        class Settings:
+            DATABASE = env.dburl("sqlite:///db.sqlite", frozen=True)
+            DATABASES = env.dburls("sqlite:///db.sqlite", frozen=True)
+            CACHE = env.cacheurl("locmem://", frozen=True)
+            HOSTS = env.list("a,b", frozen=True)
+            APPS = env.frozenset("a,b,a")
+
+        s = Settings()
+        self.assertIs(s.DATABASE, s.DATABASE)
+        self.assertEqual(s.HOSTS, ("a", "b"))
+        self.assertEqual(s.APPS, frozenset({"a", "b"}))
+        for name in ("DATABASE", "DATABASES", "CACHE", "HOSTS", "APPS"):
+            with self.subTest(name=name):
+                hash(getattr(s, name))
+
+        with self.assertRaises(TypeError):
+            s.DATABASES["default"]["NAME"] = "other.sqlite"
+
+    def test_default_and_getter(self):
+        class Settings:
+            OPTIONS = env({"list": [1, 2]}, frozen=True)
+
+            @env(frozen=True)
+            def HOSTS(self):
+                return ["a", "b"]
+
+        s = Settings()
+        self.assertEqual(s.OPTIONS, {"list": (1, 2)})
+        hash(s.OPTIONS)
+        self.assertEqual(s.HOSTS, ("a", "b"))
+
+    def test_subclass(self):
+        class FrozenEnv(env):
+            FROZEN = True
+
+        class Settings:
+            HOSTS = FrozenEnv.list("a,b")
+            DATABASE = FrozenEnv.dburl("sqlite:///db.sqlite")
+            MUTABLE = FrozenEnv.list("a,b", frozen=False)
+            GROUP = FrozenEnv.group(as_dict=True, HOSTS=env.list("a,b"))
+
+        s = Settings()
+        self.assertEqual(s.HOSTS, ("a", "b"))
+        hash(s.DATABASE)
+        self.assertEqual(s.MUTABLE, ["a", "b"])
+        self.assertEqual(s.GROUP, {"HOSTS": ("a", "b")})
+        hash(s.GROUP)
+
+
+class GroupSettings:
+    REDIS = env.group(HOST="localhost", PORT=env.int(6379))
+
+
+class EnvGroupTest(EnvTestCase):
+    def test_default(self):
+        class Settings:
+            REDIS = env.group(HOST="localhost", PORT=env.int(6379), PASSWORD=None)
+
+        redis = Settings().REDIS
+        self.assertEqual(redis, ("localhost", 6379, None))
+        self.assertEqual(redis.PORT, 6379)
+        self.assertEqual(type(redis).__name__, "REDIS")
+
+    def test_override(self):
+        class Settings:
+            REDIS = env["DJANGO_"].group("CACHE_", HOST="localhost", PORT=env.int(6379, key="TCP_PORT"))
+
+        os.environ["DJANGO_CACHE_HOST"] = "redis"
+        os.environ["DJANGO_CACHE_TCP_PORT"] = "6380"
+        os.environ["REDIS_HOST"] = "ignored"
+
+        self.assertEqual(Settings().REDIS, ("redis", 6380))
+
+    def test_as_dict(self):
+        class Settings:
+            REDIS = env.group(as_dict=True, HOST="localhost", OPTIONS=env({"db": 0}), frozen=True)
+
+        self.assertEqual(Settings().REDIS, {"HOST": "localhost", "OPTIONS": {"db": 0}})
+        hash(Settings().REDIS)
+
+    def test_errors(self):
+        class Settings:
+            REDIS = env.group(HOST=env.Required, PORT=env.int(6379), DB=env.int(0))
+
+        self.assertTrue(Settings.REDIS.required)
+
+        os.environ["REDIS_PORT"] = "x"
+        with self.assertRaises(ValueError) as cm:
+            Settings().REDIS
+
+        message = str(cm.exception)
+        self.assertIn("REDIS_HOST is required", message)
+        self.assertIn("REDIS_PORT: invalid literal", message)
+        self.assertNotIn("REDIS_DB", message)
+
+    def test_pickle(self):
+        value = GroupSettings().REDIS
+
+        self.assertEqual(pickle.loads(pickle.dumps(value)), value)  # noqa: S301
+        self.assertIs(type(pickle.loads(pickle.dumps(value))), type(value))  # noqa: S301
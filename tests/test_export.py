@@ -0,0 +1,170 @@
+import functools
+import importlib
+import json
+import os
+import sys
+import tempfile
+import unittest
+from datetime import timedelta
+from functools import partial
+from pathlib import Path
+
+from cbs import cast, export
+from cbs.__main__ import main
+from cbs.cast import frozendict
+from cbs.urls import parse_dburl_set
+
+from . import export_settings  # So reload works first time
+
+
+def run(source):
+    namespace = {}
+    exec(compile(source, "<compiled settings>", "exec"), namespace)  # noqa: S102
+    return {name: value for name, value in namespace.items() if name.isupper()}
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        os.environ.clear()
+        importlib.reload(export_settings)
+
+    def test_python(self):
+        values = run(export.as_python(export_settings))
+
+        self.assertEqual(
+            values,
+            {
+                "ALLOWED_HOSTS": ["localhost"],
+                "BASE_DIR": Path("/srv/app"),
+                "DATABASES": {"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": "/srv/app/db.sqlite"}},
+                "DEBUG": True,
+                "PORT": 8000,
+                "REDIS": ("localhost", 6379),
+                "SERVER_NAME": "localhost",
+                "SSL": False,
+                "STATICFILES_DIRS": (Path("/srv/app/static"),),
+            },
+        )
+
+        self.assertEqual((values["REDIS"].HOST, values["REDIS"].PORT), ("localhost", 6379))
+
+        # Values are fixed
+        os.environ["PORT"] = "80"
+        self.assertEqual(run(export.as_python(export_settings))["PORT"], 80)
+
+    def test_keep_env(self):
+        os.environ["PORT"] = "80"
+        source = export.as_python(export_settings, keep_env=True)
+
+        self.assertIn("PORT = _env('PORT', 8000, cast=int)", source)
+
+        values = run(source)
+        self.assertEqual(values["PORT"], 80)
+        self.assertEqual(values["ALLOWED_HOSTS"], ["localhost"])
+
+        os.environ.clear()
+        os.environ.update(SSL="yes", ALLOWED_HOSTS="a, b")
+        values = run(source)
+        self.assertEqual(values["PORT"], 8000)
+        self.assertIs(values["SSL"], True)
+        self.assertEqual(values["ALLOWED_HOSTS"], ["a", "b"])
+
+    def test_keep_env_cached(self):
+        os.environ["SERVER_NAME"] = "topsecret"
+        settings = export_settings.ExportSettings(cache=True)
+        settings.prefetch()
+        self.addCleanup(setattr, export_settings, "__getattr__", export_settings.__getattr__)
+        export_settings.__getattr__ = settings.getattr_factory()
+
+        source = export.as_python(export_settings, keep_env=True)
+
+        self.assertIn("SERVER_NAME = _env('SERVER_NAME', 'localhost')", source)
+        self.assertNotIn("topsecret", source)
+
+    def test_keep_env_required(self):
+        os.environ.update(DJANGO_MODE="exportlive", SERVER_NAME="example.com")
+        importlib.reload(export_settings)
+        source = export.as_python(export_settings, keep_env=True)
+
+        self.assertIn("SERVER_NAME = _env('SERVER_NAME')", source)
+        self.assertEqual(run(source)["SERVER_NAME"], "example.com")
+
+        del os.environ["SERVER_NAME"]
+        with self.assertRaises(ValueError):
+            run(source)
+
+    def test_json(self):
+        values = json.loads(export.as_json(export_settings))
+
+        self.assertEqual(values["BASE_DIR"], "/srv/app")
+        self.assertEqual(values["STATICFILES_DIRS"], ["/srv/app/static"])
+        self.assertIs(values["DEBUG"], True)
+        self.assertEqual(values["REDIS"], {"HOST": "localhost", "PORT": 6379})
+
+    def test_literals(self):
+        for value in [
+            None,
+            1.5,
+            b"bytes",
+            (),
+            ("one",),
+            set(),
+            {3, 1, 2},
+            frozenset({"a"}),
+            {"nested": [{"deep": (1, 2)}] * 10},
+            frozendict(a=frozenset({1})),
+            timedelta(minutes=5, microseconds=1),
+        ]:
+            with self.subTest(value=value):
+                source = f"import cbs.cast\nimport datetime\nVALUE = {export._literal(value, set())}"
+                result = run(source)["VALUE"]
+                self.assertEqual(result, value)
+                self.assertIs(type(result), type(value))
+
+        with self.assertRaises(TypeError):
+            export._literal(object(), set())
+
+    def test_reference(self):
+        imports = set()
+        namespace = {"cbs": sys.modules["cbs"], "functools": functools}
+        for func in (int, cast.as_bool, cast.as_json):
+            with self.subTest(func=func):
+                ref = export._reference(func, imports)
+                self.assertIs(eval(ref, namespace), func)  # noqa: S307
+
+        func = partial(parse_dburl_set, defaults={"CONN_MAX_AGE": 60})
+        result = eval(export._reference(func, imports), namespace)  # noqa: S307
+        self.assertEqual((result.func, result.args, result.keywords), (func.func, func.args, func.keywords))
+
+        for func in (cast.list_of(int), cast.tuple_of(sep=" ")):
+            with self.subTest(func=func):
+                ref = export._reference(func, imports)
+                self.assertEqual(eval(ref, namespace)._factory, func._factory)  # noqa: S307
+
+        self.assertIsNone(export._reference(lambda value: value, imports))
+        self.assertIsNone(export._reference(partial(int, base=object()), imports))
+
+
+class TestCommand(unittest.TestCase):
+    def setUp(self):
+        os.environ.clear()
+        os.environ["SERVER_NAME"] = "example.com"
+        # The command imports the module itself.
+        sys.modules.pop(export_settings.__name__)
+        self.addCleanup(sys.modules.__setitem__, export_settings.__name__, export_settings)
+
+    def test_compile(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = os.path.join(tmpdir, "compiled.py")
+            main(["compile", export_settings.__name__, "--mode", "exportlive", "--output", output])
+
+            with open(output) as fin:
+                values = run(fin.read())
+
+        self.assertIs(values["DEBUG"], False)
+        self.assertIs(values["SSL"], True)
+        self.assertEqual(values["SERVER_NAME"], "example.com")
+
+    def test_keep_env_json(self):
+        with self.assertRaises(SystemExit):
+            main(["compile", export_settings.__name__, "--format", "json", "--keep-env"])
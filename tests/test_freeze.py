@@ -0,0 +1,75 @@
+import importlib
+import os
+import types
+import unittest
+
+from cbs import BaseSettings, env
+
+from . import frozen_settings  # So reload works first time
+
+
+class FreezeImportedSettings(BaseSettings):
+    DEBUG = True
+
+
+class TestFreeze(unittest.TestCase):
+    def setUp(self):
+        os.environ.clear()
+
+    def test_freeze_module(self):
+        os.environ["IMMEDIATE_INT"] = "2345"
+
+        importlib.reload(frozen_settings)
+
+        module_vars = vars(frozen_settings)
+        self.assertEqual(module_vars["IMMEDIATE_INT"], 2345)
+        self.assertEqual(module_vars["METHOD"], 1)
+
+        # Values are fixed once frozen
+        os.environ["IMMEDIATE_INT"] = "1"
+        self.assertEqual(frozen_settings.IMMEDIATE_INT, 2345)
+        self.assertEqual(frozen_settings.METHOD, 1)
+
+    def test_masked(self):
+        with self.assertWarns(UserWarning):
+            importlib.reload(frozen_settings)
+
+        self.assertEqual(frozen_settings.MASKED, "global")
+
+    def test_dir(self):
+        importlib.reload(frozen_settings)
+
+        self.assertEqual(
+            sorted(dir(frozen_settings)),
+            ["IMMEDIATE_INT", "MASKED", "METHOD"],
+        )
+
+    def test_freeze_namespace(self):
+        class FreezeTargetSettings(BaseSettings):
+            DEBUG = True
+
+            UNSET = BaseSettings.Unset
+
+            @env.bool
+            def BOOL_ENV(self):
+                return not self.DEBUG
+
+        namespace = {"__name__": "test"}
+        FreezeTargetSettings().freeze(namespace)
+
+        self.assertEqual(namespace["DEBUG"], True)
+        self.assertEqual(namespace["BOOL_ENV"], False)
+        self.assertNotIn("UNSET", namespace)
+
+    def test_imported_class(self):
+        """Values go in the module calling use(), not the one defining the class."""
+        module = types.ModuleType("imported_settings")
+        module.FreezeImportedSettings = FreezeImportedSettings
+        exec(  # noqa: S102
+            '__getattr__, __dir__ = FreezeImportedSettings.use(default="freezeimported", freeze=True)',
+            vars(module),
+        )
+
+        self.assertEqual(vars(module)["DEBUG"], True)
+        self.assertNotIn("DEBUG", globals())
+        self.assertEqual(module.__dir__(), ["DEBUG"])
@@ -0,0 +1,31 @@
+import json
+import subprocess
+import sys
+import unittest
+
+CODE = "import cbs, cbs.routers, cbs.sources, cbs.tracking, cbs.urls, json, sys; print(json.dumps(list(sys.modules)))"
+
+
+class TestImport(unittest.TestCase):
+    def run_python(self, *args):
+        return subprocess.run(  # noqa: S603
+            [sys.executable, *args],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+
+    def test_no_django(self):
+        """Importing cbs must not import Django."""
+        result = self.run_python("-c", CODE)
+
+        modules = [name for name in json.loads(result.stdout) if name.split(".")[0] == "django"]
+        self.assertEqual(modules, [])
+
+    def test_importtime(self):
+        """Nothing from Django shows in -X importtime either."""
+        result = self.run_python("-X", "importtime", "-c", CODE)
+
+        imported = [line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines()]
+        self.assertIn("cbs", imported)
+        self.assertEqual([name for name in imported if name.startswith("django")], [])
@@ -0,0 +1,78 @@
+import io
+import os
+import unittest
+
+from cbs import BaseSettings, env
+
+
+class ProfiledSettings(BaseSettings):
+    DEBUG = True
+
+    FROM_ENV = env("default")
+
+    FROM_DEFAULT = env("default")
+
+    @env
+    def FROM_GETTER(self):
+        return self.DEBUG
+
+    def METHOD(self):
+        return self.FROM_ENV
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        os.environ.clear()
+        BaseSettings.enable_profiling()
+
+    def tearDown(self):
+        BaseSettings.disable_profiling()
+
+    def test_stats(self):
+        os.environ["FROM_ENV"] = "env"
+        settings = ProfiledSettings()
+
+        settings.DEBUG
+        settings.FROM_DEFAULT
+        settings.FROM_GETTER
+        settings.METHOD
+
+        stats = BaseSettings.profiling_stats()
+
+        self.assertEqual(
+            {name: (stat["count"], stat["source"]) for name, stat in stats.items()},
+            {
+                "DEBUG": (2, "value"),
+                "FROM_ENV": (1, "environ"),
+                "FROM_DEFAULT": (1, "default"),
+                "FROM_GETTER": (1, "getter"),
+                "METHOD": (1, "getter"),
+            },
+        )
+        # Time spent in dependencies is included
+        self.assertGreaterEqual(stats["METHOD"]["time"], stats["FROM_ENV"]["time"])
+
+    def test_cached(self):
+        settings = ProfiledSettings(cache=True)
+
+        settings.METHOD
+        settings.METHOD
+
+        self.assertEqual(BaseSettings.profiling_stats()["METHOD"]["count"], 1)
+
+    def test_report(self):
+        ProfiledSettings().METHOD
+
+        output = io.StringIO()
+        BaseSettings.profiling_report(output)
+
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[1].startswith("METHOD "))
+
+    def test_disabled(self):
+        BaseSettings.disable_profiling()
+
+        ProfiledSettings().METHOD
+
+        self.assertEqual(BaseSettings.profiling_stats(), {})
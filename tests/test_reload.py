@@ -0,0 +1,157 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from django.core.signals import setting_changed
+
+from cbs import BaseSettings, env
+from cbs.env import set_source
+from cbs.reload import Reloader, apply_environ
+from cbs.sources import DotEnv
+
+# Names of the getters called, in order.
+resolved = []
+
+
+class ReloadSettings(BaseSettings):
+    TIMEOUT = env.int(30)
+
+    POOL_SIZE = env.int(5)
+
+    DATABASES = env.dburls("sqlite:///db.sqlite", key="DATABASE_URL")
+
+    def CONFIG(self):
+        resolved.append("CONFIG")
+        return {"timeout": self.TIMEOUT}
+
+    def POOL(self):
+        resolved.append("POOL")
+        return {"size": self.POOL_SIZE}
+
+
+class ReloadTestCase(unittest.TestCase):
+    def setUp(self):
+        os.environ.clear()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dotenv = Path(tmp.name) / ".env"
+        self.mtime = time.time_ns()
+        self.write("TIMEOUT=10\n")
+
+        set_source(DotEnv(self.dotenv))
+        self.addCleanup(set_source)
+
+        self.settings = ReloadSettings(cache=True)
+        self.settings.CONFIG
+        self.settings.POOL
+        resolved.clear()
+
+    def write(self, content):
+        # Ensure the mtime changes, however coarse the filesystem's clock.
+        self.mtime += 1_000_000_000
+        self.dotenv.write_text(content)
+        os.utime(self.dotenv, ns=(self.mtime, self.mtime))
+
+
+class TestApply(ReloadTestCase):
+    def test_apply(self):
+        self.write("TIMEOUT=60\n")
+
+        changed = apply_environ(self.settings, {"TIMEOUT"})
+
+        self.assertEqual(changed, {"TIMEOUT": 60, "CONFIG": {"timeout": 60}})
+        self.assertEqual(self.settings.CONFIG, {"timeout": 60})
+        # Settings not using TIMEOUT are left alone.
+        self.assertEqual(resolved, ["CONFIG"])
+
+    def test_indexed(self):
+        self.write("DATABASE_URL_0=postgres://primary/app\nDATABASE_URL_1=postgres://replica/app\n")
+        self.settings.DATABASES
+
+        self.write("DATABASE_URL_0=postgres://primary/app\nDATABASE_URL_1=postgres://replica2/app\n")
+        changed = apply_environ(self.settings, {"DATABASE_URL_1"})
+
+        self.assertEqual(changed["DATABASES"]["replica_1"]["HOST"], "replica2")
+
+    def test_unchanged(self):
+        self.assertEqual(apply_environ(self.settings, {"TIMEOUT"}), {})
+        self.assertEqual(apply_environ(self.settings, {"UNUSED"}), {})
+
+    def test_uncached(self):
+        with self.assertRaises(ValueError):
+            apply_environ(ReloadSettings(), {"TIMEOUT"})
+
+
+class TestReloader(ReloadTestCase):
+    def test_check(self):
+        reloader = Reloader(self.settings)
+        self.assertEqual(reloader.paths, [os.fspath(self.dotenv)])
+        self.assertEqual(reloader.check(), {})
+
+        self.write("TIMEOUT=10\nPOOL_SIZE=20\n")
+        self.assertEqual(reloader.check(), {"POOL_SIZE": 20, "POOL": {"size": 20}})
+        self.assertEqual(resolved, ["POOL"])
+        self.assertEqual(self.settings.TIMEOUT, 10)
+
+    def test_failed(self):
+        reloader = Reloader(self.settings)
+
+        self.write("TIMEOUT=soon\n")
+        with self.assertRaises(ValueError):
+            reloader.check()
+
+        # Old values are kept, and the change is tried again next time.
+        self.assertEqual(self.settings.CONFIG, {"timeout": 10})
+
+        self.write("TIMEOUT=20\n")
+        self.assertEqual(reloader.check()["TIMEOUT"], 20)
+
+    def test_signal(self):
+        received = []
+
+        def receiver(sender, setting, value, enter, **kwargs):  # noqa: ARG001
+            received.append((sender, setting, value, enter))
+
+        setting_changed.connect(receiver)
+        self.addCleanup(setting_changed.disconnect, receiver)
+
+        reloader = Reloader(self.settings)
+        self.write("TIMEOUT=60\n")
+        reloader.check()
+
+        self.assertEqual(
+            sorted(received),
+            [
+                (ReloadSettings, "CONFIG", {"timeout": 60}, True),
+                (ReloadSettings, "TIMEOUT", 60, True),
+            ],
+        )
+
+    def test_nothing_to_watch(self):
+        set_source()
+        with self.assertRaises(ValueError):
+            Reloader(self.settings)
+
+        with self.assertRaises(ValueError):
+            Reloader(ReloadSettings(), paths=[self.dotenv])
+
+    def assertReloads(self, reloader):
+        reloader.start()
+        self.addCleanup(reloader.stop)
+
+        self.write("TIMEOUT=90\n")
+        deadline = time.monotonic() + 5
+        while self.settings.CONFIG == {"timeout": 10}:
+            self.assertLess(time.monotonic(), deadline, "Settings were not reloaded")
+            time.sleep(0.01)
+
+        reloader.stop()
+        self.assertEqual(self.settings.TIMEOUT, 90)
+
+    def test_poll(self):
+        self.assertReloads(Reloader(self.settings, interval=0.01, inotify=False))
+
+    def test_inotify(self):
+        self.assertReloads(Reloader(self.settings, interval=0.01))
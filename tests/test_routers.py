@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+from unittest import TestCase, mock
+
+from cbs.routers import ReplicaRouter
+from cbs.urls import parse_dburl_set
+
+
+def instance(db):
+    return SimpleNamespace(_state=SimpleNamespace(db=db))
+
+
+class TestReplicaRouter(TestCase):
+    def setUp(self):
+        databases = parse_dburl_set("sqlite:///primary sqlite:///one sqlite:///two")
+        databases["other"] = {"ENGINE": "django.db.backends.sqlite3", "NAME": "other"}
+        self.router = ReplicaRouter.from_databases(databases)
+
+    def test_round_robin(self):
+        reads = [self.router.db_for_read(None) for _ in range(4)]
+
+        self.assertEqual(reads, ["replica_1", "replica_2", "replica_1", "replica_2"])
+        self.assertEqual(self.router.db_for_write(None), "default")
+
+    def test_weighted(self):
+        router = ReplicaRouter(["replica_1", "replica_2"], weights={"replica_2": 3})
+
+        with mock.patch("cbs.routers.random.choices", return_value=["replica_2"]) as choices:
+            self.assertEqual(router.db_for_read(None), "replica_2")
+
+        choices.assert_called_once_with(["replica_1", "replica_2"], [1, 3])
+
+    def test_no_replicas(self):
+        router = ReplicaRouter([])
+
+        self.assertEqual(router.db_for_read(None), "default")
+
+    def test_allow_relation(self):
+        self.assertTrue(self.router.allow_relation(instance("default"), instance("replica_1")))
+        self.assertIsNone(self.router.allow_relation(instance("default"), instance("other")))
+
+    def test_allow_migrate(self):
+        self.assertTrue(self.router.allow_migrate("default", "app"))
+        self.assertFalse(self.router.allow_migrate("replica_1", "app"))
+        self.assertIsNone(self.router.allow_migrate("other", "app"))
@@ -0,0 +1,179 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from cbs import env
+from cbs.env import get_environ, set_source, snapshot
+from cbs.sources import Chain, DotEnv, SecretsDir, parse_dotenv
+
+
+class TempDirTestCase(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name)
+
+    def touch(self, path, content, mtime):
+        path.write_text(content)
+        os.utime(path, ns=(mtime, mtime))
+
+
+class TestParseDotEnv(unittest.TestCase):
+    def test_parse(self):
+        text = """
+# A comment
+
+PLAIN=value
+export EXPORTED = exported
+SINGLE='single # quoted'
+DOUBLE="line\\none \\"quoted\\""
+COMMENTED=value # comment
+QUOTED_COMMENT="x y" # comment
+SINGLE_COMMENT='q'  # c
+EMPTY=
+NOT A SETTING
+"""
+
+        self.assertEqual(
+            parse_dotenv(text),
+            {
+                "PLAIN": "value",
+                "EXPORTED": "exported",
+                "SINGLE": "single # quoted",
+                "DOUBLE": 'line\none "quoted"',
+                "COMMENTED": "value",
+                "QUOTED_COMMENT": "x y",
+                "SINGLE_COMMENT": "q",
+                "EMPTY": "",
+            },
+        )
+
+
+class TestDotEnv(TempDirTestCase):
+    def test_missing(self):
+        source = DotEnv(self.path / ".env")
+
+        self.assertEqual(dict(source), {})
+        with self.assertRaises(KeyError):
+            source["FOO"]
+
+    def test_reload_on_change(self):
+        filename = self.path / ".env"
+        self.touch(filename, "FOO=one\n", 1_000_000_000)
+        source = DotEnv(filename)
+
+        self.assertEqual(source["FOO"], "one")
+
+        with mock.patch("cbs.sources.parse_dotenv") as parse:
+            self.assertEqual(source["FOO"], "one")
+            parse.assert_not_called()
+
+        self.touch(filename, "FOO=two\n", 2_000_000_000)
+        self.assertEqual(source["FOO"], "two")
+
+
+class TestSecretsDir(TempDirTestCase):
+    def test_lookup(self):
+        self.touch(self.path / "DB_PASSWORD", "secret\n", 1_000_000_000)
+        self.touch(self.path / ".hidden", "hidden", 1_000_000_000)
+        (self.path / "subdir").mkdir()
+        source = SecretsDir(self.path)
+
+        self.assertEqual(source["DB_PASSWORD"], "secret")
+        self.assertEqual(list(source), ["DB_PASSWORD"])
+        for key in (".hidden", "subdir", "MISSING", "../DB_PASSWORD"):
+            with self.assertRaises(KeyError):
+                source[key]
+
+    def test_reload_on_change(self):
+        filename = self.path / "TOKEN"
+        self.touch(filename, "one", 1_000_000_000)
+        source = SecretsDir(self.path)
+
+        self.assertEqual(source["TOKEN"], "one")
+        self.touch(filename, "two", 2_000_000_000)
+        self.assertEqual(source["TOKEN"], "two")
+
+        filename.unlink()
+        with self.assertRaises(KeyError):
+            source["TOKEN"]
+
+    def test_missing_dir(self):
+        source = SecretsDir(self.path / "missing")
+
+        self.assertEqual(list(source), [])
+        with self.assertRaises(KeyError):
+            source["TOKEN"]
+
+
+class TestChain(unittest.TestCase):
+    def test_order(self):
+        source = Chain({"A": "first"}, {"A": "second", "B": "second"})
+
+        self.assertEqual(source["A"], "first")
+        self.assertEqual(source["B"], "second")
+        self.assertEqual(dict(source), {"A": "first", "B": "second"})
+        self.assertEqual(len(source), 2)
+        with self.assertRaises(KeyError):
+            source["C"]
+
+
+class TestSetSource(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        os.environ.clear()
+        self.addCleanup(set_source)
+
+    def test_env(self):
+        self.touch(self.path / "SECRET", "from secrets", 1_000_000_000)
+        self.touch(self.path / ".env", "SECRET=from dotenv\nDOTENV=from dotenv\n", 1_000_000_000)
+
+        class Settings:
+            SECRET = env("default")
+            DOTENV = env("default")
+            ENVIRON = env("default")
+            DEFAULT = env("default")
+
+        set_source(os.environ, SecretsDir(self.path), DotEnv(self.path / ".env"))
+        os.environ["ENVIRON"] = "from environ"
+        os.environ["DOTENV"] = "from environ"
+
+        s = Settings()
+        self.assertEqual(s.SECRET, "from secrets")
+        self.assertEqual(s.DOTENV, "from environ")
+        self.assertEqual(s.ENVIRON, "from environ")
+        self.assertEqual(s.DEFAULT, "default")
+
+        with snapshot():
+            self.assertEqual(s.SECRET, "from secrets")
+
+    def test_snapshot_lazy(self):
+        for n in range(3):
+            self.touch(self.path / f"KEY{n}", f"secret {n}", 1_000_000_000)
+
+        class Settings:
+            KEY0 = env("default")
+            OTHER = env("default")
+
+        set_source(os.environ, SecretsDir(self.path))
+        s = Settings()
+
+        with mock.patch("cbs.sources.open", side_effect=open) as opened, snapshot():
+            self.assertEqual(s.OTHER, "default")
+            self.assertEqual(opened.call_count, 0)
+
+            self.assertEqual(s.KEY0, "secret 0")
+            self.touch(self.path / "KEY0", "changed", 2_000_000_000)
+            self.assertEqual(s.KEY0, "secret 0")
+            self.assertEqual(opened.call_count, 1)
+
+        self.assertEqual(s.KEY0, "changed")
+
+    def test_reset(self):
+        set_source({"FOO": "bar"})
+        self.assertEqual(get_environ(), {"FOO": "bar"})
+
+        set_source()
+        self.assertIs(get_environ(), os.environ)
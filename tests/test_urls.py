@@ -1,6 +1,6 @@
 from unittest import TestCase
 
-from cbs.urls import parse_dburl
+from cbs.urls import parse_cacheurl, parse_dburl, parse_dburl_set
 
 
 class TestUrlParse(TestCase):
@@ -33,3 +33,201 @@ class TestUrlParse(TestCase):
                 "NAME": "db.sqlite",
             },
         )
+
+    def test_postgres_pool(self):
+        result = parse_dburl(
+            "postgres://hostname/dbname?conn_health_checks=true&pool.min_size=2&pool.max_size=10"
+            "&pool.timeout=2.5&server_side_binding=true&connect_timeout=5&sslmode=require"
+        )
+
+        self.assertEqual(result["CONN_HEALTH_CHECKS"], True)
+        self.assertEqual(
+            result["OPTIONS"],
+            {
+                "pool": {"min_size": 2, "max_size": 10, "timeout": 2.5},
+                "server_side_binding": True,
+                "connect_timeout": 5,
+                "sslmode": "require",
+            },
+        )
+
+    def test_postgres_pool_enabled(self):
+        self.assertEqual(parse_dburl("postgres://hostname/dbname?pool=true")["OPTIONS"], {"pool": True})
+        self.assertEqual(
+            parse_dburl("postgres://hostname/dbname?pool.max_size=4&pool=true")["OPTIONS"],
+            {"pool": {"max_size": 4}},
+        )
+
+    def test_mysql(self):
+        result = parse_dburl(
+            "mysql://hostname/dbname?connect_timeout=10&read_timeout=30&init_command=SET%20sql_mode%3D1"
+        )
+
+        self.assertEqual(
+            result["OPTIONS"],
+            {"connect_timeout": 10, "read_timeout": 30, "init_command": "SET sql_mode=1"},
+        )
+
+    def test_sqlite_pragmas(self):
+        result = parse_dburl(
+            "sqlite:///db.sqlite?timeout=20&transaction_mode=IMMEDIATE"
+            "&init_command=PRAGMA%20foo%3D1&journal_mode=WAL&synchronous=NORMAL"
+        )
+
+        self.assertEqual(
+            result["OPTIONS"],
+            {
+                "timeout": 20.0,
+                "transaction_mode": "IMMEDIATE",
+                "init_command": "PRAGMA foo=1;PRAGMA journal_mode=WAL;PRAGMA synchronous=NORMAL",
+            },
+        )
+
+    def test_cached(self):
+        url = "postgres://hostname/cached?local_option=test"
+        parse_dburl.cache_clear()
+
+        first = parse_dburl(url)
+        first["NAME"] = "changed"
+        first["OPTIONS"]["local_option"] = "changed"
+
+        second = parse_dburl(url)
+
+        self.assertEqual(second["NAME"], "cached")
+        self.assertEqual(second["OPTIONS"], {"local_option": "test"})
+
+        info = parse_dburl.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+
+    def test_frozen(self):
+        url = "postgres://hostname/frozen?local_option=test"
+
+        value = parse_dburl.frozen(url)
+
+        self.assertIs(parse_dburl.frozen(url), value)
+        self.assertEqual(value, parse_dburl(url))
+        self.assertEqual(hash(value), hash(parse_dburl.frozen(url)))
+        with self.assertRaises(TypeError):
+            value["OPTIONS"]["local_option"] = "changed"
+
+
+class TestCacheUrlParse(TestCase):
+    def test_redis(self):
+        result = parse_cacheurl(
+            "redis://:secret@localhost:6379/1?timeout=none&key_prefix=app"
+            "&max_connections=50&socket_timeout=0.5&retry_on_timeout=yes&serializer=my.Serializer"
+        )
+
+        self.assertEqual(
+            result,
+            {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": "redis://:secret@localhost:6379/1",
+                "TIMEOUT": None,
+                "KEY_PREFIX": "app",
+                "OPTIONS": {
+                    "max_connections": 50,
+                    "socket_timeout": 0.5,
+                    "retry_on_timeout": True,
+                    "serializer": "my.Serializer",
+                },
+            },
+        )
+
+    def test_redis_replicas(self):
+        result = parse_cacheurl("rediss://primary:6379,replica:6379/0")
+
+        self.assertEqual(
+            result["LOCATION"],
+            ["rediss://primary:6379/0", "rediss://replica:6379/0"],
+        )
+
+    def test_memcached(self):
+        result = parse_cacheurl("memcached://cache1:11211,cache2:11211?timeout=60&max_pool_size=4&no_delay=true")
+
+        self.assertEqual(
+            result,
+            {
+                "BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache",
+                "LOCATION": ["cache1:11211", "cache2:11211"],
+                "TIMEOUT": 60,
+                "OPTIONS": {
+                    "max_pool_size": 4,
+                    "no_delay": True,
+                },
+            },
+        )
+
+    def test_memcached_socket(self):
+        self.assertEqual(parse_cacheurl("pymemcache:///run/memcached.sock")["LOCATION"], "unix:/run/memcached.sock")
+        self.assertEqual(parse_cacheurl("pylibmc:///run/memcached.sock")["LOCATION"], "/run/memcached.sock")
+
+    def test_local(self):
+        self.assertEqual(
+            parse_cacheurl("locmem://unique?max_entries=500&cull_frequency=4"),
+            {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "unique",
+                "OPTIONS": {"MAX_ENTRIES": 500, "CULL_FREQUENCY": 4},
+            },
+        )
+        self.assertEqual(
+            parse_cacheurl("file:///srv/django_cache"),
+            {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": "/srv/django_cache",
+            },
+        )
+        self.assertEqual(
+            parse_cacheurl("dbcache://cache_table?version=2"),
+            {
+                "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+                "LOCATION": "cache_table",
+                "VERSION": 2,
+            },
+        )
+        self.assertEqual(
+            parse_cacheurl("dummy://"),
+            {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+        )
+
+
+class TestDbUrlSetParse(TestCase):
+    def test_set(self):
+        result = parse_dburl_set(
+            "postgres://primary/app  postgres://replica1/app?conn_max_age=0\npostgres://replica2/app",
+            defaults={"CONN_MAX_AGE": 60, "OPTIONS": {"sslmode": "require"}},
+        )
+
+        self.assertEqual(list(result), ["default", "replica_1", "replica_2"])
+        self.assertEqual(
+            result["default"],
+            {
+                "ENGINE": "django.db.backends.postgresql",
+                "NAME": "app",
+                "HOST": "primary",
+                "CONN_MAX_AGE": 60,
+                "OPTIONS": {"sslmode": "require"},
+            },
+        )
+        self.assertEqual(result["replica_1"]["CONN_MAX_AGE"], 0)
+        self.assertEqual(result["replica_2"]["TEST"], {"MIRROR": "default"})
+
+    def test_list(self):
+        result = parse_dburl_set(["sqlite:///one.db", "sqlite:///two.db"], primary="main", replica="ro")
+
+        self.assertEqual(result["main"]["NAME"], "one.db")
+        self.assertEqual(result["ro_1"]["NAME"], "two.db")
+        self.assertEqual(result["ro_1"]["TEST"], {"MIRROR": "main"})
+
+    def test_frozen(self):
+        result = parse_dburl_set("sqlite:///one.db sqlite:///two.db", frozen=True)
+
+        self.assertEqual(result["replica_1"]["TEST"], {"MIRROR": "default"})
+        hash(result)
+        with self.assertRaises(TypeError):
+            result["replica_1"]["TEST"]["MIRROR"] = "other"
+
+    def test_empty(self):
+        with self.assertRaises(ValueError):
+            parse_dburl_set("")
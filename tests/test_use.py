@@ -2,6 +2,8 @@ import importlib
 import os
 import unittest
 
+from cbs import BaseSettings
+
 from . import settings  # So reload works first time
 
 
@@ -88,3 +90,105 @@ class TestSettingsUse(unittest.TestCase):
 
         with self.assertRaises(RuntimeError):
             importlib.reload(settings)
+
+
+class TestModes(unittest.TestCase):
+    def setUp(self):
+        os.environ.clear()
+        # Classes defined here are registered on BaseSettings too; forget them
+        # afterwards, so they can't clash with other tests' modes.
+        modes = BaseSettings._BaseSettings__modes
+        saved = {mode: list(classes) for mode, classes in modes.items()}
+        self.addCleanup(modes.update, saved)
+        self.addCleanup(modes.clear)
+
+    def test_per_root(self):
+        """Each class only finds modes amongst itself and its sub-classes."""
+
+        class OneSettings(BaseSettings):
+            pass
+
+        class TwoSettings(BaseSettings):
+            pass
+
+        class OneLiveSettings(OneSettings):
+            pass
+
+        class TwoLiveSettings(TwoSettings):
+            pass
+
+        self.assertIsInstance(OneSettings.get_settings_instance("one"), OneSettings)
+        self.assertIsInstance(OneSettings.get_settings_instance("OneLive"), OneLiveSettings)
+        self.assertIsInstance(TwoSettings.get_settings_instance("twolive"), TwoLiveSettings)
+
+        with self.assertRaises(ValueError):
+            OneSettings.get_settings_instance("twolive")
+
+    def test_alias(self):
+        class AliasSettings(BaseSettings):
+            pass
+
+        class Production(AliasSettings, mode=("aliasprod", "AliasProduction")):
+            pass
+
+        class StagingSettings(AliasSettings, mode="aliasstage"):
+            pass
+
+        for mode in ("aliasprod", "aliasproduction", "ALIASPRODUCTION"):
+            with self.subTest(mode=mode):
+                self.assertIsInstance(AliasSettings.get_settings_instance(mode), Production)
+
+        for mode in ("staging", "aliasstage"):
+            with self.subTest(mode=mode):
+                self.assertIsInstance(AliasSettings.get_settings_instance(mode), StagingSettings)
+
+    def test_env(self):
+        class EnvModeSettings(BaseSettings):
+            pass
+
+        class EnvModeLiveSettings(EnvModeSettings, mode="envmodelive_alias"):
+            pass
+
+        os.environ["DJANGO_MODE"] = "envmodelive_alias"
+
+        self.assertIsInstance(EnvModeSettings.get_settings_instance(), EnvModeLiveSettings)
+
+    def test_custom_init(self):
+        """Classes defining __init__ without arguments still work with use()."""
+
+        class CustomInitSettings(BaseSettings):
+            def __init__(self):
+                super().__init__()
+                self.started = True
+
+            def VALUE(self):
+                return object()
+
+        for cache in (False, True):
+            with self.subTest(cache=cache):
+                getter, _ = CustomInitSettings.use(default="custominit", cache=cache)
+                self.assertTrue(getter.settings.started)
+                self.assertEqual(getter("VALUE") is getter("VALUE"), cache)
+
+    def test_redefined(self):
+        """A class defined again in the same module, as on reload, replaces the old one."""
+
+        class RedefinedSettings(BaseSettings):
+            pass
+
+        first = type("RedefinedLiveSettings", (RedefinedSettings,), {})
+        second = type("RedefinedLiveSettings", (RedefinedSettings,), {})
+
+        settings = RedefinedSettings.get_settings_instance("redefinedlive")
+        self.assertIsInstance(settings, second)
+        self.assertNotIsInstance(settings, first)
+
+    def test_ambiguous(self):
+        class AmbiguousSettings(BaseSettings):
+            pass
+
+        type("AmbiguousLiveSettings", (AmbiguousSettings,), {"__module__": "one.settings"})
+        type("AmbiguousLiveSettings", (AmbiguousSettings,), {"__module__": "two.settings"})
+
+        with self.assertRaisesRegex(ValueError, "one.settings.AmbiguousLiveSettings, two.settings"):
+            AmbiguousSettings.get_settings_instance("ambiguouslive")